@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+import numpy as np
+import cirq
+from qurq.sim import MimeticSimulator
+
+def build_circuit(num_qubits, depth, seed=7):
+    """Random brickwork circuit: a layer of single-qubit gates, then CNOTs on alternating pairs."""
+    rng = np.random.default_rng(seed)
+    qubits = cirq.LineQubit.range(num_qubits)
+    single_qubit_gates = [cirq.H, cirq.X, cirq.T, cirq.S, cirq.rx(0.3), cirq.ry(1.1)]
+    circuit = cirq.Circuit()
+    for layer in range(depth):
+        circuit.append(single_qubit_gates[g](q) for g, q in zip(rng.integers(len(single_qubit_gates), size=num_qubits), qubits))
+        circuit.append(cirq.CNOT(qubits[i], qubits[i + 1]) for i in range(layer % 2, num_qubits - 1, 2))
+    return circuit
+
+def benchmark(num_qubits=20, depth=20, max_workers=None):
+    print("--- Q-OS Sharded State-Vector Scaling Benchmark ---")
+    max_workers = max_workers or os.cpu_count()
+    circuit = build_circuit(num_qubits, depth)
+    print(f"Circuit: {num_qubits} qubits, {len(circuit)} moments, {len(list(circuit.all_operations()))} gates")
+    print(f"CPU cores: {os.cpu_count()}")
+
+    # Keep every run in memory, so only the worker count changes
+    state_memory = 2**num_qubits * np.dtype(np.complex64).itemsize
+
+    reference = None
+    baseline = None
+    print(f"\n{'Workers':>8} {'Time (s)':>10} {'Speedup':>9} {'Exact':>7}")
+    workers = 1
+    while workers <= max_workers:
+        sim = MimeticSimulator(state_memory=state_memory, workers=workers, checkpoint_memory=0)
+        try:
+            sim.load_circuit(circuit)
+            start = time.perf_counter()
+            sim.run()
+            elapsed = time.perf_counter() - start
+            state = np.array(sim._state_vector)
+        finally:
+            sim.close()
+
+        if reference is None:
+            reference, baseline = state, elapsed
+        exact = np.array_equal(state, reference)
+        print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}x {'yes' if exact else 'NO':>7}")
+        workers *= 2
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times MimeticSimulator.run() across 1, 2, 4, ... worker processes.")
+    parser.add_argument("--qubits", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+    benchmark(args.qubits, args.depth, args.max_workers)
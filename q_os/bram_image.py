@@ -0,0 +1,92 @@
+import os
+import numpy as np
+
+# Output formats understood by write_bram_image:
+# - 'mem': Verilog $readmemh text (one hex word per line, '@addr' per bank).
+# - 'coe': Xilinx Block Memory Generator coefficient file.
+# - 'bin': Raw little-endian words, one bank after the other.
+BRAM_FORMATS = ("mem", "coe", "bin")
+
+_HEX_ASCII = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+def _as_banks(tables, bit_depth):
+    """
+    Stacks one or more wave tables into a (banks x depth) uint64 array
+    and checks that every sample fits the DAC word.
+    """
+    banks = np.asarray(tables)
+    if banks.ndim == 1:
+        banks = banks[np.newaxis]
+    if banks.ndim != 2:
+        raise ValueError(f"Expected a wave table or a (banks x depth) array, got shape {banks.shape}")
+
+    if banks.size and (banks.min() < 0 or banks.max() > (1 << bit_depth) - 1):
+        raise ValueError(f"Samples do not fit in {bit_depth}-bit BRAM words")
+    return banks.astype(np.uint64)
+
+def _hex_lines(words, digits, terminators):
+    """
+    Formats every word as fixed-width lowercase hex in one vectorized pass.
+    Returns a uint8 array of ASCII characters, one row per word, ending
+    with the given terminator byte(s) for that row.
+    """
+    shifts = np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+    nibbles = (words[..., np.newaxis] >> shifts) & np.uint64(0xF)
+    return np.concatenate([_HEX_ASCII[nibbles], terminators], axis=-1)
+
+def build_bram_image(tables, fmt="mem", bit_depth=12):
+    """
+    Packs one or more SPHY wave tables into a single BRAM initialization image.
+
+    Each table becomes one bank of len(table) words; banks are laid out
+    back to back, so bank k starts at word address k * depth. Returns the
+    image as bytes in the requested format (see BRAM_FORMATS).
+    """
+    if fmt not in BRAM_FORMATS:
+        raise ValueError(f"Unknown BRAM image format: {fmt}")
+
+    banks = _as_banks(tables, bit_depth)
+    num_banks, depth = banks.shape
+
+    if fmt == "bin":
+        word_bytes = next(size for size in (1, 2, 4, 8) if size * 8 >= bit_depth)
+        return banks.astype(f"<u{word_bytes}").tobytes()
+
+    digits = (bit_depth + 3) // 4
+    words = banks.reshape(-1)
+
+    if fmt == "coe":
+        terminators = np.empty((words.size, 2), dtype=np.uint8)
+        terminators[:] = np.frombuffer(b",\n", dtype=np.uint8)
+        if words.size:
+            terminators[-1, 0] = ord(";")
+        header = b"memory_initialization_radix=16;\nmemory_initialization_vector=\n"
+        return header + _hex_lines(words, digits, terminators).tobytes()
+
+    # 'mem': a single table stays a plain list of words, which is what
+    # SPHY_Wave_Generator's $readmemh("sphy_table.mem") expects.
+    newlines = np.full((words.size, 1), ord("\n"), dtype=np.uint8)
+    body = _hex_lines(words, digits, newlines).reshape(num_banks, -1)
+    if num_banks == 1:
+        return body.tobytes()
+
+    address_digits = max(1, len(f"{num_banks * depth - 1:x}"))
+    return b"".join(
+        f"@{bank * depth:0{address_digits}x}\n".encode() + body[bank].tobytes()
+        for bank in range(num_banks)
+    )
+
+def write_bram_image(tables, path="sphy_table.mem", fmt=None, bit_depth=12):
+    """
+    Writes a BRAM image for one or more wave tables to path.
+
+    The format defaults to the file extension (.mem, .coe or .bin).
+    Returns the path that was written.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower() or "mem"
+
+    image = build_bram_image(tables, fmt=fmt, bit_depth=bit_depth)
+    with open(path, "wb") as f:
+        f.write(image)
+    return path
@@ -1,27 +1,137 @@
 import numpy as np
+import cirq
 
-def translate_gate(gate_name):
-    """
-    Translates a quantum gate symbol to its SPHY-wave phase shift.
-    
-    Based on Q-OS.pdf Section 3.3 AXI-Bus Parameter Injection:
-    - 'H' -> pi/2 (Superposition State)
-    - 'I' -> 0 (Classical State / Constructive Interference)
-    """
-    if gate_name == "H":
-        return np.pi / 2
-    elif gate_name == "CNOT":
-        # Represents maximum entanglement/correlation phase
-        return np.pi
-    elif gate_name == "X":
-        return np.pi
-    elif gate_name == "Z":
-        return np.pi
-    elif gate_name == "S":
-        return np.pi / 2
-    elif gate_name == "T":
-        return np.pi / 4
-    elif gate_name == "I":
-        return 0
-    else:
-        raise ValueError(f"Unknown gate: {gate_name}")
+# Phase shift per gate symbol.
+# Based on Q-OS.pdf Section 3.3 AXI-Bus Parameter Injection:
+# - 'H' -> pi/2 (Superposition State)
+# - 'I' -> 0 (Classical State / Constructive Interference)
+GATE_PHASES = {
+    "H": np.pi / 2,
+    "CNOT": np.pi, # Represents maximum entanglement/correlation phase
+    "X": np.pi,
+    "Z": np.pi,
+    "S": np.pi / 2,
+    "T": np.pi / 4,
+    "I": 0,
+}
+
+# Gate type -> translator(gate) -> phase shift. Lookups walk the gate's MRO,
+# so subclasses (e.g. cirq.Rz of cirq.ZPowGate) inherit their base translator.
+_GATE_TRANSLATORS = {}
+_resolved_translators = {}
+
+def register_gate_translator(gate_type, translator):
+    """
+    Registers translator(gate) -> phase shift for gate_type and its subclasses.
+    A later registration for the same type replaces the earlier one.
+    """
+    _GATE_TRANSLATORS[gate_type] = translator
+    _resolved_translators.clear()
+
+def _pow_gate_translator(half_turn_phase):
+    """Phase proportional to the gate exponent: exponent 1 maps to half_turn_phase."""
+    def translate(gate):
+        return half_turn_phase * float(gate.exponent)
+    return translate
+
+def _modulation_translator(gate):
+    """
+    Mimetic gates carry their phase in sphy_modulation(). Pure envelopes
+    (e.g. TopologicalStabilize) translate to the phase their decay
+    exp(-alpha * x) accumulates over one wave period: 2*pi*alpha.
+    """
+    modulation = gate.sphy_modulation()
+    if "phase_shift" in modulation:
+        return modulation["phase_shift"]
+    return 2 * np.pi * modulation.get("envelope_decay", 0)
+
+# X, Y, Z, S, T, Rx/Ry/Rz and their powers: exponent t is a rotation by pi * t
+register_gate_translator(cirq.XPowGate, _pow_gate_translator(np.pi))
+register_gate_translator(cirq.YPowGate, _pow_gate_translator(np.pi))
+register_gate_translator(cirq.ZPowGate, _pow_gate_translator(np.pi))
+register_gate_translator(cirq.HPowGate, _pow_gate_translator(np.pi / 2))
+register_gate_translator(cirq.CXPowGate, _pow_gate_translator(np.pi))
+register_gate_translator(cirq.CZPowGate, _pow_gate_translator(np.pi))
+register_gate_translator(cirq.IdentityGate, lambda gate: 0)
+
+def _register_mimetic_translators():
+    """
+    The Mimetic Hadamard and CNOT translate like the standard gates they
+    implement, independently of their sphy_modulation(). Imported late:
+    qurq.circuit imports this module.
+    """
+    from qurq.ops import MimeticHadamard, MimeticCNOT
+    register_gate_translator(MimeticHadamard, lambda gate: GATE_PHASES["H"])
+    register_gate_translator(MimeticCNOT, lambda gate: GATE_PHASES["CNOT"])
+
+def _find_translator(gate_type):
+    translator = _resolved_translators.get(gate_type)
+    if translator is None:
+        for cls in gate_type.__mro__:
+            if cls in _GATE_TRANSLATORS:
+                translator = _GATE_TRANSLATORS[cls]
+                break
+        else:
+            if hasattr(gate_type, "sphy_modulation"):
+                translator = _modulation_translator
+        _resolved_translators[gate_type] = translator
+    return translator
+
+def translate_gate(gate, resolver=None):
+    """
+    Translates a quantum gate to its SPHY-wave phase shift.
+
+    gate is either a gate symbol from GATE_PHASES (e.g. 'H', 'I') or a
+    Cirq gate. Cirq gates are dispatched on their type through the
+    translator registry, so parameterized gates such as cirq.rz(theta),
+    XPowGate exponents or TopologicalStabilize(alpha) map to values
+    derived from their parameters. Symbolic parameters are resolved with
+    resolver (a cirq.ParamResolver or dict) first.
+    """
+    if isinstance(gate, str):
+        if gate not in GATE_PHASES:
+            raise ValueError(f"Unknown gate: {gate}")
+        return GATE_PHASES[gate]
+
+    if resolver is not None:
+        gate = cirq.resolve_parameters(gate, resolver)
+    if cirq.is_parameterized(gate):
+        raise ValueError(f"Gate {gate} has unresolved parameters")
+
+    translator = _find_translator(type(gate))
+    if translator is None:
+        raise ValueError(f"Unknown gate: {gate}")
+    return translator(gate)
+
+def translate_circuit(circuit, qubits=None, resolver=None):
+    """
+    Translates a whole circuit into a (moments x qubits) array of phase shifts.
+
+    Entry [m, k] is the phase shift applied to qubits[k] in moment m
+    (0 where the qubit is idle; multi-qubit gates set all their qubits).
+    qubits defaults to sorted(circuit.all_qubits()). Each distinct gate
+    is translated once per call, so repeated gates cost a dictionary lookup.
+    """
+    if qubits is None:
+        qubits = sorted(circuit.all_qubits())
+    if resolver is not None:
+        circuit = cirq.resolve_parameters(circuit, resolver)
+
+    qubit_index = {q: i for i, q in enumerate(qubits)}
+    phases = np.zeros((len(circuit), len(qubits)))
+    cache = {}
+    for m, moment in enumerate(circuit):
+        for op in moment:
+            gate = op.gate
+            if gate is None:
+                raise ValueError(f"Operation {op} has no gate to translate")
+            try:
+                phase = cache[gate]
+            except KeyError:
+                phase = cache[gate] = translate_gate(gate)
+            except TypeError: # Unhashable gate
+                phase = translate_gate(gate)
+            phases[m, [qubit_index[q] for q in op.qubits]] = phase
+    return phases
+
+_register_mimetic_translators()
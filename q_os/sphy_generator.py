@@ -1,31 +1,194 @@
 import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+try:
+    from q_os.bram_image import write_bram_image
+except ImportError: # Run as a script: python3 q_os/sphy_generator.py
+    from bram_image import write_bram_image
 
 # Threshold for switching from full hyperposition (sum of all states)
 # to Qudit Lacing (sum of per-qubit harmonics) to avoid exponential complexity.
+# This is the default; callers can pass lacing_threshold to trade cost for detail.
 QUDIT_LACING_THRESHOLD = 4
 
-def get_sphy_waves():
+# Above this many harmonics, synthesis switches from the cached basis table
+# (O(harmonics * points)) to a single inverse real FFT (O(points log points)).
+FFT_SYNTHESIS_CUTOVER = 64
+
+# Alpha-Hamiltonian regularization constants (see get_regularized_sphy_waves).
+LAMBDA = 2.618033
+ALPHA = 0.007292
+
+# C-O Symmetry Constant (Approximated from paper logic for smoothing).
+# Placeholder for C-O constant; sets the hyperposition envelope exp(-sigma * x / 2pi).
+CO_SYMMETRY_SIGMA = 0.14
+
+# Upper bound on distinct parameter sets kept per reference wave table.
+# Tables are returned read-only because every caller shares the same array.
+REFERENCE_CACHE_SIZE = 64
+
+@dataclass(frozen=True)
+class WaveSpec:
+    """
+    Output format of a SPHY wave table.
+
+    - points: Samples per period over x = linspace(0, 2*pi, points).
+    - bit_depth: DAC resolution; samples span 0 .. 2^bit_depth - 1.
+    - dtype: Integer dtype of the returned table. The default keeps the
+      historical int64 output; uint16 holds a 12-bit sample in 2 bytes.
+    - float_dtype: Working precision of state-driven synthesis (basis
+      tables, marginals, harmonic sums, normalization). float32 pairs
+      with complex64 state vectors and halves memory traffic.
+    """
+    points: int = 256
+    bit_depth: int = 12
+    dtype: object = int
+    float_dtype: object = np.float64
+
+    def __post_init__(self):
+        object.__setattr__(self, "dtype", np.dtype(self.dtype))
+        object.__setattr__(self, "float_dtype", np.dtype(self.float_dtype))
+        if self.float_dtype.kind != "f":
+            raise ValueError(f"float_dtype must be a floating point type, got {self.float_dtype}")
+        if self.points < 2:
+            raise ValueError(f"WaveSpec needs at least 2 points, got {self.points}")
+        if self.dtype.kind not in "iu" or self.max_code > np.iinfo(self.dtype).max:
+            raise ValueError(f"dtype {self.dtype} cannot hold {self.bit_depth}-bit samples")
+
+    @property
+    def max_code(self):
+        """Largest DAC code, e.g. 4095 for 12 bits."""
+        return (1 << self.bit_depth) - 1
+
+DEFAULT_WAVE_SPEC = WaveSpec()
+
+# 12-bit samples in uint16: a quarter of the default int64 footprint.
+COMPACT_WAVE_SPEC = WaveSpec(dtype=np.uint16)
+
+# Compact output with float32 synthesis end to end (e.g. on the Zynq ARM target).
+SINGLE_PRECISION_WAVE_SPEC = WaveSpec(dtype=np.uint16, float_dtype=np.float32)
+
+def _scale_to_dac(w, spec):
+    """
+    Normalizes the float wave w to the DAC range of spec.
+
+    Each row along the last axis is min/max normalized independently, so a
+    (batch x points) array is scaled in one call. The normalization runs in
+    place on w, and the result is cast straight into a preallocated buffer
+    of spec.dtype, so no intermediate float or int64 arrays are created.
+    w must be a scratch array.
+    """
+    w_min = np.min(w, axis=-1, keepdims=True)
+    w_range = np.max(w, axis=-1, keepdims=True) - w_min
+    np.subtract(w, w_min, out=w)
+    # Flat rows (w_range == 0) stay at zero instead of dividing by zero
+    np.divide(w, w_range, out=w, where=w_range > 0)
+    np.multiply(w, spec.max_code, out=w)
+
+    final = np.empty(w.shape, dtype=spec.dtype)
+    np.copyto(final, w, casting="unsafe") # Truncates like astype(int)
+    return final
+
+@lru_cache(maxsize=32)
+def get_harmonic_basis(resolution=256, max_harmonic=1, dtype=np.float64):
+    """
+    Returns the cached sine/cosine basis table for wave synthesis.
+
+    Shape is (2, max_harmonic, resolution): row [0, k] is sin((k+1)x) and
+    row [1, k] is cos((k+1)x) over x = linspace(0, 2*pi, resolution).
+    A sum of harmonics a_k * sin((k+1)x + phi_k) is then a single product:
+    stack([a*cos(phi), a*sin(phi)]).reshape(-1) @ basis.reshape(-1, resolution).
+    The table is computed in double precision and stored as dtype.
+    It is shared between callers, so it is returned read-only.
+    """
+    x = np.linspace(0, 2 * np.pi, resolution)
+    angles = np.arange(1, max_harmonic + 1)[:, None] * x
+    basis = np.stack([np.sin(angles), np.cos(angles)]).astype(dtype, copy=False)
+    basis.setflags(write=False)
+    return basis
+
+def synthesize_harmonics_fft(sin_coeffs, cos_coeffs, points=256, fold=True):
+    """
+    Synthesizes sum_k A_k*sin((k+1)x) + B_k*cos((k+1)x) with one inverse real FFT.
+
+    x = linspace(0, 2*pi, points) includes the endpoint, so the wave is
+    periodic over the first points - 1 samples: those come from
+    numpy.fft.irfft and the last sample repeats the first.
+
+    Harmonics above Nyquist ((points - 1) // 2) are handled as follows:
+    - fold=True: each harmonic f is added to its alias bin f mod (points - 1),
+      mirrored (with conjugated phase) into the lower half of the spectrum.
+      On this sample grid that is exactly what the direct sum evaluates to.
+    - fold=False: they are truncated (dropped).
+    Leading axes of the coefficient arrays are treated as a batch.
+    """
+    sin_coeffs = np.asarray(sin_coeffs)
+    cos_coeffs = np.asarray(cos_coeffs)
+    period = points - 1
+    if not fold:
+        sin_coeffs = sin_coeffs[..., :period // 2]
+        cos_coeffs = cos_coeffs[..., :period // 2]
+
+    batch_shape = sin_coeffs.shape[:-1]
+    num_harmonics = sin_coeffs.shape[-1]
+
+    # Slot f holds harmonic f as the complex amplitude B - iA, so that
+    # Re((B - iA) * e^(ifx)) = A*sin(fx) + B*cos(fx). Slot 0 (DC) starts empty.
+    # Padding to whole periods and summing them folds every alias onto f mod period.
+    length = -(-(num_harmonics + 1) // period) * period
+    folded = np.zeros(batch_shape + (length,), dtype=np.result_type(sin_coeffs, np.complex64))
+    folded[..., 1:num_harmonics + 1] = cos_coeffs - 1j * sin_coeffs
+    folded = folded.reshape(batch_shape + (-1, period)).sum(axis=-2)
+
+    # Bins above Nyquist mirror onto period - bin as complex conjugates; DC and
+    # Nyquist only keep their real part, which this sum doubles as irfft expects.
+    bins = np.arange(period // 2 + 1)
+    spectrum = folded[..., bins] + np.conj(folded[..., -bins % period])
+    spectrum *= period / 2
+
+    wave = np.fft.irfft(spectrum, n=period, axis=-1)
+    return np.concatenate([wave, wave[..., :1]], axis=-1)
+
+def synthesize_harmonics(sin_coeffs, cos_coeffs, points=256, dtype=np.float64):
+    """
+    Returns sum_k A_k*sin((k+1)x) + B_k*cos((k+1)x) over linspace(0, 2*pi, points).
+
+    Up to FFT_SYNTHESIS_CUTOVER harmonics this is one product with the
+    cached basis table; beyond that it uses synthesize_harmonics_fft (folding
+    harmonics above Nyquist onto their aliases, which matches the direct sum).
+    Both paths run in the precision of dtype when the coefficients allow it.
+    """
+    num_harmonics = np.shape(sin_coeffs)[-1]
+    if num_harmonics > FFT_SYNTHESIS_CUTOVER:
+        return synthesize_harmonics_fft(
+            np.asarray(sin_coeffs, dtype=dtype), np.asarray(cos_coeffs, dtype=dtype), points
+        )
+
+    coeffs = np.concatenate([sin_coeffs, cos_coeffs], axis=-1)
+    basis = get_harmonic_basis(points, num_harmonics, dtype)
+    return coeffs @ basis.reshape(-1, points)
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def get_sphy_waves(spec=DEFAULT_WAVE_SPEC):
     """
     Generates the CLASSICAL SPHY wave data points.
     Based on 'The SPHY-Wave Transducer' (Old Model).
-    Returns a numpy array of 12-bit integers (0-4095).
+    Returns a cached, read-only numpy array of 12-bit integers (0-4095)
+    by default; see WaveSpec for other resolutions and dtypes.
     """
-    # 256 points from 0 to 2*pi
-    x = np.linspace(0, 2 * np.pi, 256)
+    # spec.points points from 0 to 2*pi
+    x = np.linspace(0, 2 * np.pi, spec.points)
     
     # Waveform synthesis: sin(x) + 0.5*sin(2x) + 0.25*sin(4x)
     w = np.sin(x) + 0.5 * np.sin(2 * x) + 0.25 * np.sin(4 * x)
     
-    # Normalization to 0-1 range
-    w_min = np.min(w)
-    w_max = np.max(w)
-    norm = (w - w_min) / (w_max - w_min)
-    
-    # Scale to 12-bit integer (0-4095)
-    final = (norm * 4095).astype(int)
+    # Normalize and scale to the DAC range (0-4095 for 12 bits)
+    final = _scale_to_dac(w, spec)
+    final.setflags(write=False)
     return final
 
-def get_regularized_sphy_waves():
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def get_regularized_sphy_waves(lam=LAMBDA, alpha=ALPHA, spec=DEFAULT_WAVE_SPEC):
     """
     Generates the TOPOLOGICALLY STABILIZED SPHY wave data points.
     Based on 'Topological Stabilization... via Alpha-Hamiltonian Regularization' (New Model).
@@ -33,118 +196,247 @@ def get_regularized_sphy_waves():
     Constants:
     - Lambda (~2.618033): Transcendental anchoring parameter.
     - Alpha (0.007292): Metric flattening coefficient.
+
+    The table is cached per (lambda, alpha, spec) and returned read-only.
     """
-    LAMBDA = 2.618033
-    ALPHA = 0.007292
-    
-    x = np.linspace(0, 2 * np.pi, 256)
+    x = np.linspace(0, 2 * np.pi, spec.points)
     
     # Regularized Wave Equation:
     # W_reg(x) = (sin(x) + (1/lambda)*sin(2x) + (1/lambda^2)*sin(4x)) * e^(-alpha * x)
     
     harmonic_1 = np.sin(x)
-    harmonic_2 = (1.0 / LAMBDA) * np.sin(2 * x)
-    harmonic_3 = (1.0 / (LAMBDA**2)) * np.sin(4 * x)
+    harmonic_2 = (1.0 / lam) * np.sin(2 * x)
+    harmonic_3 = (1.0 / (lam**2)) * np.sin(4 * x)
     
-    envelope = np.exp(-ALPHA * x)
+    envelope = np.exp(-alpha * x)
     
     w_reg = (harmonic_1 + harmonic_2 + harmonic_3) * envelope
     
     # Normalization
-    w_min = np.min(w_reg)
-    w_max = np.max(w_reg)
-    norm = (w_reg - w_min) / (w_max - w_min)
-    
-    final = (norm * 4095).astype(int)
+    final = _scale_to_dac(w_reg, spec)
+    final.setflags(write=False)
     return final
 
-def get_entangled_sphy_waves(coupling_strength=1.0):
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def get_entangled_sphy_waves(coupling_strength=1.0, spec=DEFAULT_WAVE_SPEC):
     """
     Generates the ENTANGLED SPHY wave data points.
     Represents the interaction between two qubits (Control-Target).
     
     Model: Coupled Harmonic Oscillator with beat frequency.
     W_ent(x) = sin(x) * cos(coupling_strength * x) + 0.5*sin(2x)
+
+    The table is cached per (coupling_strength, spec) and returned read-only.
     """
-    x = np.linspace(0, 2 * np.pi, 256)
+    x = np.linspace(0, 2 * np.pi, spec.points)
     
     # Simple beat frequency model for entanglement
     w_ent = np.sin(x) * np.cos(coupling_strength * x) + 0.5 * np.sin(2 * x)
     
     # Normalization
-    w_min = np.min(w_ent)
-    w_max = np.max(w_ent)
-    norm = (w_ent - w_min) / (w_max - w_min)
-    
-    final = (norm * 4095).astype(int)
+    final = _scale_to_dac(w_ent, spec)
+    final.setflags(write=False)
     return final
 
-def get_sphy_wave_from_quantum_state(state_vector: np.ndarray, num_qubits: int = None):
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def _get_base_regularized_wave(points=256, dtype=np.float64):
+    """Regularized reference wave scaled to 0-1, shared by every state-driven wave."""
+    base = (get_regularized_sphy_waves(spec=WaveSpec(points=points)) / 4095.0).astype(dtype, copy=False)
+    base.setflags(write=False)
+    return base
+
+def get_qubit_marginals(state_vector: np.ndarray, num_qubits: int = None, qubits=None):
+    """
+    Returns P(q_k = 1) for every qubit k of the state vector.
+
+    Qubit 0 is the most significant bit of the basis index (Cirq ordering).
+    The probability vector is folded in half once per qubit: the upper half
+    holds the basis states where the leading qubit is 1, and summing both
+    halves marginalizes that qubit out. Total work is ~2 * 2^n additions
+    instead of n * 2^n interpreted iterations.
+
+    Leading axes are treated as a batch: a (batch x 2^n) input returns
+    (batch x n) marginals.
+
+    If qubits (a sequence of qubit indices) is given, only those marginals
+    are computed, in that order, each with one read of half the vector.
+    """
+    if num_qubits is None:
+        num_qubits = int(np.log2(np.shape(state_vector)[-1]))
+
+    remaining = np.abs(state_vector)
+    np.square(remaining, out=remaining)
+    batch_shape = remaining.shape[:-1]
+    if qubits is not None:
+        marginals = np.empty(batch_shape + (len(qubits),), dtype=remaining.dtype)
+        for j, k in enumerate(qubits):
+            blocks = remaining.reshape(batch_shape + (2**k, 2, -1))
+            marginals[..., j] = blocks[..., 1, :].sum(axis=(-2, -1))
+        return marginals
+
+    marginals = np.empty(batch_shape + (num_qubits,), dtype=remaining.dtype)
+    for k in range(num_qubits):
+        halves = remaining.reshape(batch_shape + (2, -1))
+        marginals[..., k] = halves[..., 1, :].sum(axis=-1)
+        remaining = halves[..., 0, :] + halves[..., 1, :]
+    return marginals
+
+def _synthesize_state_waves(state_vectors, num_qubits, spec, lacing_threshold):
+    """
+    Float (unscaled) SPHY waves for state vectors along the last axis.
+    Shared by the single-state and batched entry points. Works in
+    spec.float_dtype and updates temporaries in place.
+    """
+    points = spec.points
+    float_dtype = spec.float_dtype
+    if num_qubits > lacing_threshold:
+        # --- Qudit Lacing Mode (Scalable) ---
+        # One harmonic per qubit: sum_k P(q_k = 1) * sin((k+1)x)
+        marginals = get_qubit_marginals(state_vectors, num_qubits).astype(float_dtype, copy=False)
+        w_state = marginals @ get_harmonic_basis(points, num_qubits, float_dtype)[0]
+
+        # Normalize
+        w_state /= num_qubits
+            
+    else:
+        # --- Full Hyperposition Mode (Detailed) ---
+        # One harmonic per basis state: sum_i 0.5*|a_i|^2 * sin((i+1)x + arg(a_i)),
+        # with the phase split as sin(fx + phi) = cos(phi)sin(fx) + sin(phi)cos(fx).
+        # Large state vectors go through the FFT path (see synthesize_harmonics).
+        amplitudes = np.abs(state_vectors)
+        np.square(amplitudes, out=amplitudes)
+        amplitudes *= 0.5
+        phases = np.angle(state_vectors)
+        sin_coeffs = np.cos(phases)
+        sin_coeffs *= amplitudes
+        cos_coeffs = np.sin(phases, out=phases)
+        cos_coeffs *= amplitudes
+        w_state = synthesize_harmonics(sin_coeffs, cos_coeffs, points, float_dtype)
+
+    # Add a base regularized wave for stability/context
+    w_state += _get_base_regularized_wave(points, w_state.dtype)
+    return w_state
+
+def get_sphy_wave_from_quantum_state(state_vector: np.ndarray, num_qubits: int = None, spec: WaveSpec = DEFAULT_WAVE_SPEC,
+                                     lacing_threshold: int = QUDIT_LACING_THRESHOLD):
     """
     Generates a SPHY wave that visually represents the quantum state vector.
     
-    If num_qubits > QUDIT_LACING_THRESHOLD, uses 'Qudit Lacing' (String Lacing Theory):
+    If num_qubits > lacing_threshold, uses 'Qudit Lacing' (String Lacing Theory):
     - Each qubit is a 'string' vibrating at a unique harmonic frequency (k+1).
     - Amplitude is proportional to the probability P(q_k = 1).
     - Sums n harmonic waves instead of 2^n basis states.
     
-    If num_qubits <= QUDIT_LACING_THRESHOLD, uses 'Full Hyperposition':
+    If num_qubits <= lacing_threshold, uses 'Full Hyperposition':
     - Sums all basis states weighted by their probability amplitude.
+    - Synthesized by FFT for large n, so raising lacing_threshold to 8-14
+      costs O(2^n + points log points) rather than O(2^n * points).
+
+    The output resolution, bit depth and dtype follow spec.
     """
-    x = np.linspace(0, 2 * np.pi, 256)
-    w_state = np.zeros_like(x)
+    state_vector = np.asarray(state_vector)
 
     # Infer num_qubits if not provided (assuming 2^n length)
     if num_qubits is None:
         num_qubits = int(np.log2(len(state_vector)))
 
-    probabilities = np.abs(state_vector)**2
+    w_state = _synthesize_state_waves(state_vector, num_qubits, spec, lacing_threshold)
 
-    if num_qubits > QUDIT_LACING_THRESHOLD:
-        # --- Qudit Lacing Mode (Scalable) ---
-        # Optimized: calculate all marginals in one pass? No, n is small enough.
-        # Just ensure indentation is correct.
-        for k in range(num_qubits):
-            prob_one = 0.0
-            # Sum probabilities for states where k-th qubit is 1
-            for i in range(len(probabilities)):
-                if (i >> (num_qubits - 1 - k)) & 1:
-                    prob_one += probabilities[i]
-            
-            # Add harmonic for this qubit
-            w_state += prob_one * np.sin((k + 1) * x)
-            
-        # Normalize
-        if num_qubits > 0:
-            w_state /= num_qubits
-            
-    else:
-        # --- Full Hyperposition Mode (Detailed) ---
-        num_basis_states = len(probabilities)
-        scale_factor = 0.5 
+    # Normalization to DAC range
+    final = _scale_to_dac(w_state, spec)
+    # print(f"Generated SPHY wave (n={num_qubits}): min={np.min(final)}, max={np.max(final)}") 
+    return final
 
-        for i in range(num_basis_states):
-            frequency = i + 1
-            amplitude = probabilities[i] * scale_factor
-            w_state += amplitude * np.sin(frequency * x + np.angle(state_vector[i]))
+def get_sphy_wave_from_lacing(lacing_sum: np.ndarray, num_qubits: int, spec: WaveSpec = DEFAULT_WAVE_SPEC):
+    """
+    Finishes a Qudit Lacing wave from its harmonic sum.
 
-    # Add a base regularized wave for stability/context
-    base_reg_wave = get_regularized_sphy_waves() / 4095.0 
-    w_state += base_reg_wave
+    lacing_sum is sum_k P(q_k = 1) * sin((k+1)x) over spec.points samples,
+    i.e. get_qubit_marginals(...) @ get_harmonic_basis(spec.points, n)[0].
+    Callers that track marginals between steps (MimeticSimulator) update
+    that sum term by term and only pay for normalization here.
+    """
+    w_state = lacing_sum / num_qubits
+    w_state += _get_base_regularized_wave(spec.points, w_state.dtype)
+    return _scale_to_dac(w_state, spec)
 
-    # Normalization to DAC range
-    w_min = np.min(w_state)
-    w_max = np.max(w_state)
-    if w_max > w_min: # Avoid division by zero
-        norm = (w_state - w_min) / (w_max - w_min)
+def get_sphy_waves_from_quantum_states(state_vectors: np.ndarray, num_qubits: int = None, spec: WaveSpec = DEFAULT_WAVE_SPEC,
+                                       lacing_threshold: int = QUDIT_LACING_THRESHOLD):
+    """
+    Batched get_sphy_wave_from_quantum_state for sweeps and timelines.
+
+    Takes a (batch x 2^n) array of state vectors and returns a
+    (batch x spec.points) wave array. Marginals, harmonic synthesis and
+    the per-row min/max normalization are all vectorized over the batch.
+    """
+    state_vectors = np.asarray(state_vectors)
+    if state_vectors.ndim != 2:
+        raise ValueError(f"Expected a (batch x 2^n) array of state vectors, got shape {state_vectors.shape}")
+
+    if num_qubits is None:
+        num_qubits = int(np.log2(state_vectors.shape[1]))
+
+    w_states = _synthesize_state_waves(state_vectors, num_qubits, spec, lacing_threshold)
+    return _scale_to_dac(w_states, spec)
+
+def get_qudit_marginals(state_vector: np.ndarray, qid_shape):
+    """
+    Returns the level distribution of every qudit of a joint state vector.
+
+    qid_shape lists the qudit dimensions, most significant first (Cirq
+    ordering). The result is a list of arrays; entry j has qid_shape[j]
+    probabilities P(qudit_j = m).
+    """
+    probabilities = (np.abs(np.asarray(state_vector))**2).reshape(tuple(qid_shape))
+    axes = range(len(qid_shape))
+    return [probabilities.sum(axis=tuple(a for a in axes if a != j)) for j in axes]
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def _get_co_envelope(points=256):
+    """C-O sphere smoothing envelope exp(-sigma * x / 2pi), cached per resolution."""
+    x = np.linspace(0, 2 * np.pi, points)
+    envelope = np.exp(-CO_SYMMETRY_SIGMA * x / (2*np.pi))
+    envelope.setflags(write=False)
+    return envelope
+
+def get_qudit_hyperposition_wave(state_vector: np.ndarray, qid_shape=None, spec: WaveSpec = DEFAULT_WAVE_SPEC):
+    """
+    Generates the C-O SPHERE HYPERPOSITION wave for arbitrary qudit states.
+
+    Each level m of a qudit is a harmonic on the C-O sphere:
+    - A single d-level qudit (qid_shape=(d,), the default) maps |m> to
+      harmonic m+1 with amplitude |a_m| and phase arg(a_m).
+    - Several qudits with mixed dimensions are laced: qudit j owns the
+      next qid_shape[j] harmonics, weighted by sqrt(P(qudit_j = m)) from
+      its marginal level distribution (zero phase, since a joint state
+      has no per-qudit phase).
+    The harmonic sum reuses the cached basis tables and is smoothed by the
+    C-O symmetry envelope. Amplitudes need not be normalized; the DAC
+    scaling removes any overall factor.
+    """
+    state_vector = np.asarray(state_vector)
+    if qid_shape is None:
+        qid_shape = (len(state_vector),)
+    if int(np.prod(qid_shape)) != len(state_vector):
+        raise ValueError(f"State of length {len(state_vector)} does not match qid_shape {tuple(qid_shape)}")
+
+    if len(qid_shape) == 1:
+        amplitudes = np.abs(state_vector)
+        phases = np.angle(state_vector)
+        sin_coeffs = amplitudes * np.cos(phases)
+        cos_coeffs = amplitudes * np.sin(phases)
     else:
-        norm = w_state - w_min # Flat line
-    
-    final = (norm * 4095).astype(int)
-    # print(f"Generated SPHY wave (n={num_qubits}): min={np.min(final)}, max={np.max(final)}") 
-    return final
+        sin_coeffs = np.sqrt(np.concatenate(get_qudit_marginals(state_vector, qid_shape)))
+        cos_coeffs = np.zeros_like(sin_coeffs)
 
-def get_14_qudit_hyperposition_waves():
+    w_hyper = synthesize_harmonics(sin_coeffs, cos_coeffs, spec.points, spec.float_dtype)
+    w_hyper *= _get_co_envelope(spec.points)
+
+    # Normalization to DAC range
+    return _scale_to_dac(w_hyper, spec)
+
+@lru_cache(maxsize=REFERENCE_CACHE_SIZE)
+def get_14_qudit_hyperposition_waves(spec=DEFAULT_WAVE_SPEC):
     """
     Generates the C-O SPHERE HYPERPOSITION wave.
     Represents a 14-level Qudit system (d=14).
@@ -152,34 +444,38 @@ def get_14_qudit_hyperposition_waves():
     Theory:
     Instead of binary superposition, we sum 14 distinct harmonics 
     to represent the 'Hyperposition' vector on the C-O Sphere.
+
+    This is the fixed reference table; see get_qudit_hyperposition_wave
+    for waves driven by actual qudit amplitudes.
+    The table is cached per spec and returned read-only.
     """
     d = 14
-    x = np.linspace(0, 2 * np.pi, 256)
-    w_hyper = np.zeros_like(x)
     
     # Summation of 14 basis states (Harmonics)
     # Each harmonic n represents state |n>
-    for n in range(1, d + 1):
-        # We use a decaying amplitude 1/n to keep total energy bounded
-        # This is a simplification of the 'Discrete Vector Summation'
-        amplitude = 1.0 / np.sqrt(n) 
-        w_hyper += amplitude * np.sin(n * x)
-        
-    # Apply C-O Symmetry Constant (Approximated from paper logic for smoothing)
-    sigma = 0.14 # Placeholder for C-O constant
-    envelope = np.exp(-sigma * x / (2*np.pi))
-    
-    w_hyper *= envelope
+    # We use a decaying amplitude 1/sqrt(n) to keep total energy bounded
+    # This is a simplification of the 'Discrete Vector Summation'
+    amplitudes = 1.0 / np.sqrt(np.arange(1, d + 1))
+    final = get_qudit_hyperposition_wave(amplitudes, spec=spec)
+    final.setflags(write=False)
+    return final
 
-    # Normalization to DAC range
-    w_min = np.min(w_hyper)
-    w_max = np.max(w_hyper)
-    norm = (w_hyper - w_min) / (w_max - w_min)
-    
-    final = (norm * 4095).astype(int)
+def _get_mode_waves(mode, spec):
+    if mode == "14_qudit":
+        final = get_14_qudit_hyperposition_waves(spec=spec)
+        print("Generated 14-Qudit Hyperposition Waves.")
+    elif mode == "entangled":
+        final = get_entangled_sphy_waves(spec=spec)
+        print("Generated Entangled SPHY Waves.")
+    elif mode == "classical":
+        final = get_sphy_waves(spec=spec)
+        print("Generated Classical SPHY Waves.")
+    else:
+        final = get_regularized_sphy_waves(spec=spec)
+        print("Generated Regularized SPHY Waves.")
     return final
 
-def generate_sphy_waves(mode="regularized"):
+def generate_sphy_waves(mode="regularized", spec=DEFAULT_WAVE_SPEC, path="sphy_table.mem", fmt=None):
     """
     Generates the SPHY wave table and writes it to 'sphy_table.mem'.
     Modes:
@@ -187,24 +483,15 @@ def generate_sphy_waves(mode="regularized"):
     - 'regularized': Alpha-Stabilized waves (Qubit).
     - '14_qudit': C-O Sphere Hyperposition (Qudit).
     - 'entangled': Entangled CNOT state (Qubit-Qubit).
+
+    A list of modes packs one bank per mode into the same image. The image
+    format follows fmt or the extension of path ('mem', 'coe' or 'bin');
+    see q_os.bram_image.
     """
-    if mode == "14_qudit":
-        final = get_14_qudit_hyperposition_waves()
-        print("Generated 14-Qudit Hyperposition Waves.")
-    elif mode == "entangled":
-        final = get_entangled_sphy_waves()
-        print("Generated Entangled SPHY Waves.")
-    elif mode == "classical":
-        final = get_sphy_waves()
-        print("Generated Classical SPHY Waves.")
-    else:
-        final = get_regularized_sphy_waves()
-        print("Generated Regularized SPHY Waves.")
-    
-    # Write to file in hex format
-    with open("sphy_table.mem", "w") as f:
-        for val in final:
-            f.write(f"{val:03x}\n")
+    modes = [mode] if isinstance(mode, str) else list(mode)
+    tables = np.stack([_get_mode_waves(m, spec) for m in modes])
+
+    return write_bram_image(tables, path, fmt=fmt, bit_depth=spec.bit_depth)
 
 if __name__ == "__main__":
     # Default to the most advanced mode
@@ -1,8 +1,50 @@
+import numpy as np
 import cirq
+from q_os.quantum_translator import translate_gate
+from q_os.sphy_generator import (
+    get_regularized_sphy_waves, get_entangled_sphy_waves, COMPACT_WAVE_SPEC, LAMBDA
+)
+
+# Wave types of schedule entries; the schedule stores their index
+SPHY_WAVE_TYPES = ("SPYSPI", "HPHYSPI", "ENTANGLED")
+
+# Qubit slots per schedule entry (-1 when unused); wider operations keep their first ones
+SCHEDULE_MAX_QUBITS = 3
+
+# One row per operation: qubit indices into MimeticCircuit.sphy_schedule_qubits
+SPHY_SCHEDULE_DTYPE = np.dtype([
+    ("moment", np.int32),
+    ("qubits", np.int32, (SCHEDULE_MAX_QUBITS,)),
+    ("phase", np.float64),
+    ("envelope", np.float64),
+    ("coupling", np.float64),
+    ("wave_type", np.uint8),
+])
+
+def _modulation(op):
+    """
+    SPHY modulation of an operation: Mimetic gates provide their own;
+    standard gates take their phase from the quantum translator, with
+    multi-qubit gates rendered as fully coupled ENTANGLED waves.
+    """
+    if hasattr(op.gate, "sphy_modulation"):
+        return op.gate.sphy_modulation()
+    try:
+        phase = translate_gate(op.gate)
+    except (ValueError, TypeError): # Measurements, symbolic or untranslatable gates
+        phase = 0.0
+    if len(op.qubits) > 1:
+        return {"phase_shift": phase, "coupling_strength": 1.0, "wave_type": "ENTANGLED"}
+    return {"phase_shift": phase, "wave_type": "SPYSPI"}
 
 class MimeticCircuit(cirq.Circuit):
     """
     A Cirq-compatible circuit that tracks SPHY wave evolution.
+
+    Its SPHY schedule (see sphy_schedule) is kept as a structured array and
+    brought up to date when read: operations added to the end of existing
+    moments or in new moments (as add/append do) extend it in place, any
+    other mutation rebuilds it.
     """
     def add(self, *args, **kwargs):
         """
@@ -10,23 +52,150 @@ class MimeticCircuit(cirq.Circuit):
         """
         return self.append(*args, **kwargs)
 
-    def to_sphy_schedule(self):
+    @property
+    def sphy_schedule(self):
         """
-        Compiles the circuit into a time-ordered list of SPHY wave modulations.
-        """
-        schedule = []
-        for moment in self:
-            for op in moment:
-                if hasattr(op.gate, 'sphy_modulation'):
-                    mod = op.gate.sphy_modulation()
-                    schedule.append({
-                        "qubits": [q.name for q in op.qubits],
-                        "modulation": mod
-                    })
-                # Handle standard Cirq gates by mapping them if possible
-                elif op.gate == cirq.H:
-                     schedule.append({
-                        "qubits": [q.name for q in op.qubits],
-                        "modulation": {"phase_shift": 1.5708, "wave_type": "SPYSPI"}
-                    })
+        The compiled SPHY schedule: a read-only SPHY_SCHEDULE_DTYPE array with
+        one row per operation (moment, qubit indices, phase, envelope decay,
+        coupling strength, index into SPHY_WAVE_TYPES), in the order operations
+        were added (those added between two reads in moment order).
+        """
+        self._sync_schedule()
+        schedule = self._schedule[:self._schedule_size]
+        schedule.flags.writeable = False
         return schedule
+
+    @property
+    def sphy_schedule_qubits(self):
+        """Qubits of the schedule's qubit indices, in order of first appearance."""
+        self._sync_schedule()
+        return list(self._schedule_qubit_index)
+
+    def _sync_schedule(self):
+        """Brings the schedule up to date with the moments, appending rows for new operations."""
+        scheduled = self.__dict__.get("_scheduled_moments")
+        moments = self._moments
+        if scheduled is None or len(scheduled) > len(moments):
+            scheduled = self._reset_schedule()
+
+        added = []
+        for i, moment in enumerate(moments):
+            if i < len(scheduled):
+                old = scheduled[i]
+                if moment is old:
+                    continue
+                if moment.operations[:len(old.operations)] != old.operations:
+                    # Not an append: rebuild from scratch
+                    self._reset_schedule()
+                    return self._sync_schedule()
+                new_ops = moment.operations[len(old.operations):]
+            else:
+                new_ops = moment.operations
+            added.extend((i, op) for op in new_ops)
+        self._scheduled_moments = list(moments)
+        if added:
+            self._extend_schedule(added)
+
+    def _reset_schedule(self):
+        self._schedule = np.empty(0, dtype=SPHY_SCHEDULE_DTYPE)
+        self._schedule_size = 0
+        self._schedule_qubit_index = {}
+        self._schedule_entries = [] # The to_sphy_schedule entry of each row, as the gate reported it
+        self._scheduled_moments = []
+        self._timelines = {} # spec -> (schedule rows rendered, wave sums, row counts, timeline)
+        return self._scheduled_moments
+
+    def _extend_schedule(self, added):
+        """Appends (moment index, operation) rows, growing the buffer geometrically."""
+        size = self._schedule_size + len(added)
+        if size > len(self._schedule):
+            grown = np.empty(max(size, 2 * len(self._schedule)), dtype=SPHY_SCHEDULE_DTYPE)
+            grown[:self._schedule_size] = self._schedule[:self._schedule_size]
+            self._schedule = grown
+
+        rows = self._schedule[self._schedule_size:size]
+        rows["qubits"] = -1
+        qubit_index = self._schedule_qubit_index
+        for row, (moment, op) in zip(rows, added):
+            mod = _modulation(op)
+            indices = [qubit_index.setdefault(q, len(qubit_index)) for q in op.qubits]
+            row["moment"] = moment
+            row["qubits"][:min(len(indices), SCHEDULE_MAX_QUBITS)] = indices[:SCHEDULE_MAX_QUBITS]
+            row["phase"] = mod.get("phase_shift", 0.0)
+            row["envelope"] = mod.get("envelope_decay", 0.0)
+            row["coupling"] = mod.get("coupling_strength", 0.0)
+            row["wave_type"] = SPHY_WAVE_TYPES.index(mod.get("wave_type", "SPYSPI"))
+            self._schedule_entries.append({"qubits": [str(q) for q in op.qubits], "modulation": mod})
+        self._schedule_size = size
+
+    def to_sphy_schedule(self):
+        """
+        Compiles the circuit into a time-ordered list of SPHY wave modulations,
+        each as its gate reported it. Follows sphy_schedule; prefer the array
+        for bulk processing.
+        """
+        order = np.argsort(self.sphy_schedule["moment"], kind="stable")
+        entries = self._schedule_entries
+        return [{"qubits": list(entries[i]["qubits"]), "modulation": dict(entries[i]["modulation"])} for i in order]
+
+    def render_sphy_timeline(self, spec=COMPACT_WAVE_SPEC):
+        """
+        Renders the whole schedule as one (moments x spec.points) wave table
+        of spec.dtype, for scrubbing through the circuit or a bulk upload.
+
+        Each operation contributes its gate waveform (SPYSPI: the regularized
+        wave scaled by cos(phase / 2); HPHYSPI: the regularized wave with its
+        envelope decay as alpha; ENTANGLED: the entangled wave at its coupling
+        strength) and a moment is the mean of its operations' waveforms;
+        empty moments show the regularized wave. The per-moment sums are kept
+        per spec, so operations appended since the last call are the only
+        ones rendered. The returned table is shared and read-only.
+        """
+        schedule = self.sphy_schedule
+        rendered, sums, counts, timeline = self._timelines.get(spec, (0, None, None, None))
+        num_moments = len(self._moments)
+        if timeline is not None and rendered == len(schedule) and len(timeline) == num_moments:
+            return timeline
+
+        if sums is None or len(sums) < num_moments:
+            grown_sums = np.zeros((num_moments, spec.points))
+            grown_counts = np.zeros(num_moments, dtype=np.int64)
+            if sums is not None:
+                grown_sums[:len(sums)] = sums
+                grown_counts[:len(counts)] = counts
+            sums, counts = grown_sums, grown_counts
+
+        rows = schedule[rendered:]
+        np.add.at(sums, rows["moment"], _row_waveforms(rows, spec))
+        np.add.at(counts, rows["moment"], 1)
+
+        filled = counts > 0
+        means = np.empty((num_moments, spec.points))
+        np.divide(sums, counts[:, np.newaxis], out=means, where=filled[:, np.newaxis])
+        means[~filled] = get_regularized_sphy_waves(spec=spec)
+        # Phases past pi scale the wave negative: clip to the DAC range, then truncate like astype(int)
+        np.clip(means, 0, spec.max_code, out=means)
+        timeline = np.empty((num_moments, spec.points), dtype=spec.dtype)
+        np.copyto(timeline, means, casting="unsafe")
+        timeline.setflags(write=False)
+        self._timelines[spec] = (len(schedule), sums, counts, timeline)
+        return timeline
+
+def _row_waveforms(rows, spec):
+    """Float (len(rows) x points) waveforms of schedule rows, one lookup per distinct parameter."""
+    waves = np.empty((len(rows), spec.points))
+    types = rows["wave_type"]
+
+    spyspi = types == SPHY_WAVE_TYPES.index("SPYSPI")
+    regularized = get_regularized_sphy_waves(spec=spec).astype(np.float64)
+    waves[spyspi] = regularized * np.cos(rows["phase"][spyspi] / 2)[:, np.newaxis]
+
+    for wave_type, field, table in (
+        ("HPHYSPI", "envelope", lambda alpha: get_regularized_sphy_waves(LAMBDA, alpha, spec)),
+        ("ENTANGLED", "coupling", lambda coupling: get_entangled_sphy_waves(coupling, spec)),
+    ):
+        selected = np.flatnonzero(types == SPHY_WAVE_TYPES.index(wave_type))
+        values, inverse = np.unique(rows[field][selected], return_inverse=True)
+        for j, value in enumerate(values):
+            waves[selected[inverse == j]] = table(float(value))
+    return waves
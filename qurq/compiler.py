@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+import numpy as np
+import cirq
+from .kernels import operation_unitary, fuse_operations
+from .stabilizer import is_clifford_circuit
+
+# Compiled circuits kept for reloads of an unchanged circuit
+PLAN_CACHE_SIZE = 32
+# Fused moment ranges kept per plan (run() from a few distinct steps)
+FUSED_CACHE_SIZE = 8
+
+_plan_cache = OrderedDict() # hash of the structure key -> (key, CircuitPlan), least recently used first
+
+@dataclass(frozen=True, eq=False)
+class CircuitPlan:
+    """
+    A circuit compiled for MimeticSimulator: its (immutable) moments, the
+    sorted qubits and their state-vector indices, and per moment the
+    (axes, unitary tensor) of every operation (unitary None for measurements
+    and other non-unitary ops), whether the moment is unitary and the qubit
+    indices it touches.
+
+    The Clifford check is computed on first use and kept with the plan,
+    as are the fused blocks of the FUSED_CACHE_SIZE most recently used
+    unitary moment ranges.
+    """
+    moments: tuple
+    qubits: tuple
+    qubit_index: dict
+    operations: tuple = field(repr=False)
+    unitary_moments: tuple
+    touched: tuple
+    dtype: np.dtype
+    _fused: OrderedDict = field(default_factory=OrderedDict, repr=False)
+
+    @cached_property
+    def is_clifford(self):
+        return is_clifford_circuit(cirq.Circuit.from_moments(*self.moments))
+
+    def fused_blocks(self, start, stop):
+        """
+        Blocks of the unitary moments start..stop-1 fused into at most two
+        qubits each (see qurq.kernels.fuse_operations), cached per range.
+        """
+        blocks = self._fused.get((start, stop))
+        if blocks is not None:
+            self._fused.move_to_end((start, stop))
+            return blocks
+        operations = [op for moment in self.moments[start:stop] for op in moment]
+        blocks = self._fused[(start, stop)] = fuse_operations(operations, self.qubit_index, self.dtype)
+        if len(self._fused) > FUSED_CACHE_SIZE:
+            self._fused.popitem(last=False)
+        return blocks
+
+def _structure_key(circuit, dtype):
+    """Hashable key of a circuit's moments and operations (value-compared gates and qubits)."""
+    return (dtype,) + tuple(tuple(moment.operations) for moment in circuit)
+
+def _compile(circuit, dtype):
+    qubits = tuple(sorted(circuit.all_qubits()))
+    qubit_index = {q: i for i, q in enumerate(qubits)}
+    operations, unitary_moments, touched = [], [], []
+    for moment in circuit:
+        ops = tuple((tuple(qubit_index[q] for q in op.qubits), operation_unitary(op, dtype)) for op in moment)
+        operations.append(ops)
+        unitary_moments.append(all(unitary is not None for _, unitary in ops))
+        touched.append(sorted(qubit_index[q] for q in moment.qubits))
+    return CircuitPlan(
+        tuple(circuit.moments), qubits, qubit_index, tuple(operations), tuple(unitary_moments), tuple(touched), dtype
+    )
+
+def compile_circuit(circuit, dtype=np.complex64):
+    """
+    Returns the CircuitPlan of a circuit, from an LRU of PLAN_CACHE_SIZE
+    plans keyed by the circuit's structure, so loading an unchanged circuit
+    again (even a freshly built, equal one) skips compilation. Circuits
+    with unhashable operations are compiled every time.
+    """
+    dtype = np.dtype(dtype)
+    try:
+        key = _structure_key(circuit, dtype)
+        digest = hash(key) # Hashed once: every op of the circuit goes into it
+    except TypeError: # Unhashable operation
+        return _compile(circuit, dtype)
+    entry = _plan_cache.get(digest)
+    if entry is not None and entry[0] == key:
+        _plan_cache.move_to_end(digest)
+        return entry[1]
+
+    plan = _compile(circuit, dtype)
+    _plan_cache[digest] = (key, plan)
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
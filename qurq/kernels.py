@@ -0,0 +1,248 @@
+import numpy as np
+import cirq
+from functools import lru_cache
+
+# Distinct gates whose unitaries are kept ready for compiled plans and fused blocks (see qurq.compiler)
+UNITARY_CACHE_SIZE = 256
+
+@lru_cache(maxsize=UNITARY_CACHE_SIZE)
+def _cached_gate_unitary(gate, dtype):
+    if not cirq.has_unitary(gate):
+        return None
+    k = cirq.num_qubits(gate)
+    unitary = cirq.unitary(gate).astype(dtype).reshape((2,) * (2 * k))
+    unitary.setflags(write=False)
+    return unitary
+
+def gate_unitary(gate, dtype=np.complex64):
+    """
+    Returns the unitary of a k-qubit gate as a read-only (2,)*2k tensor
+    (output axes first), or None if the gate has no unitary.
+    Unitaries are cached per gate, so repeated gates skip Cirq's protocols.
+    """
+    dtype = np.dtype(dtype)
+    try:
+        return _cached_gate_unitary(gate, dtype)
+    except TypeError: # Unhashable gate
+        return _cached_gate_unitary.__wrapped__(gate, dtype)
+
+def operation_unitary(op, dtype=np.complex64):
+    """Returns the (2,)*2k unitary tensor of an operation, or None if it has none."""
+    if op.gate is not None:
+        return gate_unitary(op.gate, dtype)
+    if not cirq.has_unitary(op):
+        return None
+    return cirq.unitary(op).astype(dtype).reshape((2,) * (2 * len(op.qubits)))
+
+def apply_unitary(state, unitary, axes):
+    """
+    Applies a (2,)*2k unitary tensor to the given axes of a (2,)*n state tensor.
+    Axis i of the state is qubit i in big-endian order (Cirq's convention),
+    and axes lists the target qubits in the operation's qubit order.
+    Returns the new state tensor.
+    """
+    k = len(axes)
+    result = np.tensordot(unitary, state, axes=(range(k, 2 * k), axes))
+    return np.moveaxis(result, range(k), axes)
+
+def _embed_unitary(unitary, axes, targets):
+    """
+    Re-expresses a unitary tensor acting on axes as one acting on targets
+    (a superset of axes, in the given order), tensoring in identities.
+    """
+    extra = [a for a in targets if a not in axes]
+    for _ in extra:
+        unitary = np.multiply.outer(unitary, np.eye(2, dtype=unitary.dtype)) # Appends (out, in)
+    m, e = len(axes), len(extra)
+    out_axes = list(range(m)) + [2 * m + 2 * j for j in range(e)]
+    in_axes = list(range(m, 2 * m)) + [2 * m + 2 * j + 1 for j in range(e)]
+    current = list(axes) + extra
+    order = [current.index(a) for a in targets]
+    return unitary.transpose([out_axes[i] for i in order] + [in_axes[i] for i in order])
+
+def fuse_operations(operations, qubit_index, dtype=np.complex64, max_fused_qubits=2):
+    """
+    Fuses a sequence of unitary operations into blocks of at most
+    max_fused_qubits qubits.
+
+    An operation is folded into the latest block touching any of its qubits
+    when their union stays within max_fused_qubits; no later block shares
+    those qubits, so the reordering is exact. Returns a list of
+    (axes, unitary tensor) blocks in application order, or None if some
+    operation has no unitary.
+    """
+    blocks = []
+    last_block = {} # state axis -> index of the latest block touching it
+    for op in operations:
+        unitary = operation_unitary(op, dtype)
+        if unitary is None:
+            return None
+        axes = [qubit_index[q] for q in op.qubits]
+
+        b = max((last_block[a] for a in axes if a in last_block), default=None)
+        if b is not None:
+            block_axes, block_unitary = blocks[b]
+            targets = list(block_axes) + [a for a in axes if a not in block_axes]
+            if len(targets) <= max_fused_qubits:
+                block_unitary = _embed_unitary(block_unitary, block_axes, targets)
+                # Left-multiply: apply the operation to the block's output axes
+                fused = apply_unitary(block_unitary, unitary, [targets.index(a) for a in axes])
+                blocks[b] = (targets, fused)
+                for a in axes:
+                    last_block[a] = b
+                continue
+
+        blocks.append((axes, unitary))
+        for a in axes:
+            last_block[a] = len(blocks) - 1
+    return blocks
+
+def apply_blocks(state_vector, blocks, num_qubits):
+    """Applies fused (axes, unitary) blocks to a flat state vector and returns the new one."""
+    state = state_vector.reshape((2,) * num_qubits)
+    for axes, unitary in blocks:
+        state = apply_unitary(state, unitary, axes)
+    return np.ascontiguousarray(state).reshape(-1)
+
+def apply_blocks_to_chunk_group(view, lead, bits, blocks, num_qubits):
+    """
+    Applies (axes, matrix tensor) blocks in place to one group of chunks of
+    a state vector.
+
+    view is the state reshaped to (2,)*m + (chunk,), so its m leading
+    qubits select a contiguous chunk. lead lists the (sorted) leading qubits
+    the blocks act on; bits fixes the other leading qubits. The 2^len(lead)
+    chunks of the group are loaded together, updated by every block and
+    written back once. Blocks may not act on leading qubits outside lead.
+    """
+    m = view.ndim - 1
+    free = [a for a in range(m) if a not in lead]
+    index = [slice(None)] * m
+    for a, bit in zip(free, bits):
+        index[a] = bit
+    index = tuple(index)
+
+    group = np.array(view[index])
+    tensor = group.reshape((2,) * (len(lead) + num_qubits - m))
+    for axes, unitary in blocks:
+        local_axes = [lead.index(a) if a < m else len(lead) + a - m for a in axes]
+        tensor = apply_unitary(tensor, unitary, local_axes)
+    view[index] = tensor.reshape(group.shape)
+
+def apply_unitary_batched(states, unitaries, axes):
+    """
+    Applies per-state unitaries to a batch of state tensors.
+
+    states has shape (batch,) + (2,)*n and unitaries (batch,) + (2,)*2k
+    (output axes first); axes lists the k target qubits. Each state is
+    contracted with its own unitary in a single batched matmul. Returns
+    the new batch of state tensors.
+    """
+    k = len(axes)
+    batch = states.shape[0]
+    targets = [1 + a for a in axes]
+    # Move the targets last and flatten: (batch, rest, 2^k) @ U^T is one batched matmul
+    moved = np.moveaxis(states, targets, range(states.ndim - k, states.ndim))
+    flat = moved.reshape(batch, -1, 2**k)
+    matrices = unitaries.reshape(batch, 2**k, 2**k)
+    result = np.matmul(flat, matrices.transpose(0, 2, 1)).reshape(moved.shape)
+    return np.moveaxis(result, range(states.ndim - k, states.ndim), targets)
+
+def sweep_unitaries(op, resolvers, dtype=np.complex64):
+    """
+    Returns the (len(resolvers),) + (2,)*2k unitaries of a parameterized
+    operation at every sweep point, or None if some resolved operation has
+    no unitary.
+
+    Eigen gates with a symbolic exponent (rx/ry/rz, XPowGate, CZPowGate, ...)
+    are built in one vectorized pass from their eigen-decomposition,
+    U(t) = sum_l exp(i pi t (l + shift)) P_l; other gates are resolved and
+    converted point by point.
+    """
+    gate = op.gate
+    k = len(op.qubits)
+    components = None
+    if isinstance(gate, cirq.EigenGate):
+        try:
+            components = [(float(half_turns), np.asarray(projector, dtype=np.complex128))
+                          for half_turns, projector in gate._eigen_components()]
+        except TypeError: # Symbolic eigen-decomposition (e.g. a parameterized phase exponent)
+            pass
+    if components is not None:
+        exponents = np.array([float(resolver.value_of(gate.exponent)) for resolver in resolvers])
+        unitaries = sum(
+            np.exp(1j * np.pi * (half_turns + gate.global_shift) * exponents)[:, np.newaxis, np.newaxis] * projector
+            for half_turns, projector in components
+        )
+        return unitaries.astype(dtype).reshape((len(resolvers),) + (2,) * (2 * k))
+
+    unitaries = []
+    for resolver in resolvers:
+        unitary = operation_unitary(cirq.resolve_parameters(op, resolver), dtype)
+        if unitary is None:
+            return None
+        unitaries.append(unitary)
+    return np.stack(unitaries)
+
+def measure_batched(states, axes, rng):
+    """
+    Measures the given qubit axes of a batch of trajectory state tensors
+    ((batch,) + (2,)*n) in place: each trajectory samples every qubit from
+    its own marginal and is projected onto the outcome and renormalized.
+    Returns the (batch x len(axes)) outcome bits.
+    """
+    batch = states.shape[0]
+    outcomes = np.empty((batch, len(axes)), dtype=np.uint8)
+    for j, a in enumerate(axes):
+        halves = np.moveaxis(states, 1 + a, 1)
+        p0 = np.square(np.abs(halves[:, 0])).reshape(batch, -1).sum(axis=1)
+        p1 = np.square(np.abs(halves[:, 1])).reshape(batch, -1).sum(axis=1)
+        bits = rng.random(batch) * (p0 + p1) < p1
+        halves[bits, 0] = 0
+        halves[~bits, 1] = 0
+        norms = np.sqrt(np.where(bits, p1, p0)).astype(states.real.dtype)
+        states /= norms.reshape((batch,) + (1,) * (states.ndim - 1))
+        outcomes[:, j] = bits
+    return outcomes
+
+def apply_channel_batched(states, op, axes, rng):
+    """
+    Applies a quantum channel to a batch of trajectory state tensors
+    ((batch,) + (2,)*n), picking one Kraus branch per trajectory.
+
+    Mixtures of unitaries (depolarizing, bit/phase flips) draw every
+    trajectory's branch from the fixed mixture probabilities and apply the
+    chosen unitaries in one batched matmul. Measurements collapse each
+    trajectory in place (see measure_batched). General channels (amplitude
+    or phase damping) weigh the branches ||K_m psi||^2 one Kraus operator
+    at a time, then apply each operator only to the trajectories that
+    picked it and renormalize. Returns the new batch.
+    """
+    batch = states.shape[0]
+    k = len(axes)
+    if cirq.has_mixture(op):
+        probabilities, unitaries = zip(*cirq.mixture(op))
+        branches = rng.choice(len(probabilities), size=batch, p=np.asarray(probabilities) / sum(probabilities))
+        stack = np.stack([np.asarray(u).astype(states.dtype).reshape((2,) * (2 * k)) for u in unitaries])
+        return apply_unitary_batched(states, stack[branches], axes)
+    if cirq.is_measurement(op):
+        measure_batched(states, axes, rng)
+        return states
+
+    targets = [1 + a for a in axes]
+    operators = [np.asarray(kraus).astype(states.dtype).reshape((2,) * (2 * k)) for kraus in cirq.kraus(op)]
+    weights = np.empty((batch, len(operators))) # ||K_m psi||^2 per trajectory and branch
+    for m, kraus in enumerate(operators):
+        weights[:, m] = np.square(np.abs(apply_unitary(states, kraus, targets))).reshape(batch, -1).sum(axis=1)
+    cdf = np.cumsum(weights, axis=1)
+    branches = (rng.random(batch)[:, np.newaxis] * cdf[:, -1:] >= cdf).sum(axis=1)
+    np.minimum(branches, len(operators) - 1, out=branches)
+
+    chosen = np.empty_like(states)
+    for m, kraus in enumerate(operators):
+        rows = np.flatnonzero(branches == m)
+        if len(rows):
+            chosen[rows] = apply_unitary(states[rows], kraus, targets)
+    norms = np.sqrt(weights[np.arange(batch), branches]).astype(states.real.dtype)
+    chosen /= norms.reshape((batch,) + (1,) * (chosen.ndim - 1))
+    return chosen
@@ -0,0 +1,133 @@
+import tempfile
+import numpy as np
+import cirq
+from q_os.sphy_generator import get_qubit_marginals
+from .kernels import apply_blocks_to_chunk_group, operation_unitary
+
+# Amplitudes per chunk: 2**16 complex64 amplitudes are 512 KiB, about one L2 cache
+CHUNK_SIZE = 2**16
+# Widest circuit the memory-mapped backend accepts (2 GiB of complex64 amplitudes)
+MAX_MEMMAP_QUBITS = 28
+
+def create_memmap_state(num_qubits, dtype=np.complex64, directory=None):
+    """
+    Returns a |0...0> state vector stored in an np.memmap backed by an
+    anonymous temporary file (in directory, if given). The file is removed
+    by the OS once the array is no longer referenced.
+    """
+    if num_qubits > MAX_MEMMAP_QUBITS:
+        raise ValueError(f"Circuit too large for memory-mapped simulation (max {MAX_MEMMAP_QUBITS} qubits).")
+    with tempfile.TemporaryFile(dir=directory) as f:
+        # The mapping keeps the (already unlinked) file alive after the handle is closed
+        state = np.memmap(f, dtype=dtype, mode="w+", shape=(2**num_qubits,))
+    state[0] = 1.0
+    return state
+
+def _leading_qubits(num_qubits, chunk_size):
+    """Number of leading qubits whose bits select a chunk of at most chunk_size amplitudes."""
+    return max(0, num_qubits - int(np.log2(chunk_size)))
+
+def apply_unitary_chunked(state, unitary, axes, num_qubits, chunk_size=CHUNK_SIZE):
+    """
+    Applies a (2,)*2k matrix tensor to the given qubit axes of a flat state
+    vector in place, one chunk at a time.
+
+    The state is split on its leading qubits into contiguous chunks of
+    chunk_size amplitudes. Chunks that differ only in a leading target
+    qubit are loaded together (at most 2^k of them), so every chunk is read
+    and written once per call. The matrix need not be unitary (see
+    measure_chunked).
+    """
+    m = _leading_qubits(num_qubits, chunk_size)
+    lead = sorted(a for a in axes if a < m)
+    view = state.reshape((2,) * m + (-1,))
+    for bits in np.ndindex(*(2,) * (m - len(lead))):
+        apply_blocks_to_chunk_group(view, lead, bits, [(axes, unitary)], num_qubits)
+
+def chunk_marginals(chunk, chunk_index, leading, qubits):
+    """
+    Contribution of one chunk (the amplitudes whose `leading` leading qubits
+    spell chunk_index) to P(q_k = 1) for the given qubit indices.
+    """
+    marginals = np.zeros(len(qubits), dtype=np.abs(chunk[:1]).dtype)
+    trail = [j for j, k in enumerate(qubits) if k >= leading]
+    if trail:
+        num_qubits = leading + int(np.log2(len(chunk)))
+        marginals[trail] = get_qubit_marginals(chunk, num_qubits - leading, qubits=[qubits[j] - leading for j in trail])
+    lead = [j for j, k in enumerate(qubits) if k < leading and (chunk_index >> (leading - 1 - k)) & 1]
+    if lead:
+        marginals[lead] = np.vdot(chunk, chunk).real
+    return marginals
+
+def get_qubit_marginals_chunked(state, num_qubits, qubits=None, chunk_size=CHUNK_SIZE):
+    """
+    Returns P(q_k = 1) for the given qubits (default: all) of a flat state
+    vector, streaming once over its chunks. Leading qubits take the norm of
+    whole chunks; trailing ones reuse get_qubit_marginals per chunk.
+    """
+    qubits = list(range(num_qubits) if qubits is None else qubits)
+    m = _leading_qubits(num_qubits, chunk_size)
+    chunks = state.reshape(2**m, -1)
+    marginals = np.zeros(len(qubits), dtype=np.abs(state[:1]).dtype)
+    for b in range(2**m):
+        marginals += chunk_marginals(np.asarray(chunks[b]), b, m, qubits)
+    return marginals
+
+def get_joint_distribution_chunked(state, num_qubits, qubits, chunk_size=CHUNK_SIZE):
+    """
+    Returns the joint outcome distribution of the given qubit indices as a
+    (2,)*k float64 array (axes in the order of qubits), streaming once over
+    the chunks of a flat state vector and summing out the other qubits.
+    """
+    qubits = list(qubits)
+    m = _leading_qubits(num_qubits, chunk_size)
+    trail = [k - m for k in qubits if k >= m]
+    summed = tuple(a for a in range(num_qubits - m) if a not in trail)
+    order = np.argsort(np.argsort(trail)) # Summed axes come out ascending; restore the order of qubits
+
+    joint = np.zeros((2,) * len(qubits))
+    chunks = state.reshape(2**m, -1)
+    for b in range(2**m):
+        probs = np.abs(np.asarray(chunks[b])).astype(np.float64)
+        np.square(probs, out=probs)
+        part = probs.reshape((2,) * (num_qubits - m)).sum(axis=summed).transpose(order)
+        index = tuple((b >> (m - 1 - k)) & 1 if k < m else slice(None) for k in qubits)
+        joint[index] += part
+    return joint
+
+def measure_chunked(state, axes, num_qubits, rng, chunk_size=CHUNK_SIZE):
+    """
+    Measures the given qubit axes in place: each qubit is sampled from its
+    streamed marginal and the state is projected onto the outcome and
+    renormalized. Returns the outcome bits.
+    """
+    outcomes = []
+    for a in axes:
+        p1 = float(get_qubit_marginals_chunked(state, num_qubits, [a], chunk_size)[0])
+        bit = int(rng.random() < p1)
+        projector = np.zeros((2, 2), dtype=state.dtype)
+        projector[bit, bit] = 1 / np.sqrt(p1 if bit else 1 - p1)
+        apply_unitary_chunked(state, projector, [a], num_qubits, chunk_size)
+        outcomes.append(bit)
+    return outcomes
+
+def apply_moment_chunked(state, moment, qubit_index, rng, chunk_size=CHUNK_SIZE):
+    """
+    Applies every operation of a moment to a memory-mapped state vector in
+    place. Measurements collapse the state (see measure_chunked); other
+    non-unitary operations are not supported. Returns True if the moment
+    was unitary.
+    """
+    num_qubits = len(qubit_index)
+    unitary_moment = True
+    for op in moment:
+        axes = [qubit_index[q] for q in op.qubits]
+        unitary = operation_unitary(op, state.dtype)
+        if unitary is not None:
+            apply_unitary_chunked(state, unitary, axes, num_qubits, chunk_size)
+        elif cirq.is_measurement(op):
+            measure_chunked(state, axes, num_qubits, rng, chunk_size)
+            unitary_moment = False
+        else:
+            raise ValueError(f"Operation {op} is not supported by the memory-mapped backend")
+    return unitary_moment
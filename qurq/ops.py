@@ -7,7 +7,17 @@ class MimeticOperation(cirq.Operation):
         """Returns the SPHY wave modulation parameters."""
         raise NotImplementedError
 
-class MimeticHadamard(cirq.Gate):
+class MimeticGate(cirq.Gate):
+    """Base class for Mimetic gates: serializable with cirq.to_json under the 'qurq' namespace."""
+    @classmethod
+    def _json_namespace_(cls):
+        return "qurq"
+
+    def _json_dict_(self):
+        return cirq.obj_to_dict_helper(self, [])
+
+@cirq.value_equality
+class MimeticHadamard(MimeticGate):
     """
     A Mimetic Hadamard gate.
     Maps to a Pi/2 phase shift in the SPYSPI wave.
@@ -15,6 +25,9 @@ class MimeticHadamard(cirq.Gate):
     def _num_qubits_(self):
         return 1
 
+    def _value_equality_values_(self):
+        return ()
+
     def _unitary_(self):
         return cirq.unitary(cirq.H)
 
@@ -24,7 +37,8 @@ class MimeticHadamard(cirq.Gate):
     def sphy_modulation(self):
         return {"phase_shift": np.pi / 2, "wave_type": "SPYSPI"}
 
-class TopologicalStabilize(cirq.Gate):
+@cirq.value_equality
+class TopologicalStabilize(MimeticGate):
     """
     Applies Alpha-Hamiltonian Regularization to the qubit.
     """
@@ -34,16 +48,23 @@ class TopologicalStabilize(cirq.Gate):
     def _num_qubits_(self):
         return 1
 
+    def _value_equality_values_(self):
+        return self.alpha
+
     def _unitary_(self):
         return np.eye(2)
 
     def _circuit_diagram_info_(self, args):
         return f"Stabilize(α={self.alpha})"
 
+    def _json_dict_(self):
+        return cirq.obj_to_dict_helper(self, ["alpha"])
+
     def sphy_modulation(self):
         return {"envelope_decay": self.alpha, "wave_type": "HPHYSPI"}
 
-class MimeticCNOT(cirq.Gate):
+@cirq.value_equality
+class MimeticCNOT(MimeticGate):
     """
     A Mimetic CNOT gate.
     Represents a conditional phase inversion in the SPHY wave.
@@ -51,6 +72,9 @@ class MimeticCNOT(cirq.Gate):
     def _num_qubits_(self):
         return 2
 
+    def _value_equality_values_(self):
+        return ()
+
     def _unitary_(self):
         return cirq.unitary(cirq.CNOT)
 
@@ -61,6 +85,14 @@ class MimeticCNOT(cirq.Gate):
         # In the mimetic model, entanglement is a high-frequency harmonic coupling
         return {"coupling_strength": 1.0, "wave_type": "ENTANGLED"}
 
+def json_resolver(cirq_type):
+    """Resolver for cirq.read_json: maps 'qurq.<Gate>' types back to the Mimetic gate classes."""
+    return {
+        "qurq.MimeticHadamard": MimeticHadamard,
+        "qurq.TopologicalStabilize": TopologicalStabilize,
+        "qurq.MimeticCNOT": MimeticCNOT,
+    }.get(cirq_type)
+
 # Expose instances
 H = MimeticHadamard()
 CNOT = MimeticCNOT()
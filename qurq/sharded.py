@@ -0,0 +1,144 @@
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+from .kernels import apply_blocks_to_chunk_group
+from .memmap_state import chunk_marginals
+
+# Worker-side view of the shared state vector, set up by _attach_worker
+_worker_memory = None
+_worker_state = None
+_worker_shard_qubits = 0
+
+def _attach_worker(layout):
+    """
+    Maps the shared state vector described by layout = (name, num_qubits,
+    dtype, shard_qubits), unless this worker already has it mapped. The
+    buffer of an earlier layout is released first.
+    """
+    global _worker_memory, _worker_state, _worker_shard_qubits
+    name, num_qubits, dtype, shard_qubits = layout
+    if _worker_memory is not None and _worker_memory.name == name:
+        return
+    if _worker_memory is not None:
+        _worker_state = None
+        try:
+            _worker_memory.close()
+        except BufferError:
+            pass
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_state = np.ndarray((2**num_qubits,), dtype=dtype, buffer=_worker_memory.buf)
+    _worker_shard_qubits = shard_qubits
+
+def _apply_to_group(task):
+    layout, lead, bits, blocks = task
+    _attach_worker(layout)
+    view = _worker_state.reshape((2,) * _worker_shard_qubits + (-1,))
+    num_qubits = int(np.log2(_worker_state.size))
+    apply_blocks_to_chunk_group(view, lead, bits, blocks, num_qubits)
+
+def _shard_marginals(task):
+    layout, shard, qubits = task
+    _attach_worker(layout)
+    chunk = _worker_state.reshape(2**_worker_shard_qubits, -1)[shard]
+    return chunk_marginals(chunk, shard, _worker_shard_qubits, qubits)
+
+def _release_memory(memory):
+    try:
+        memory.close()
+    except BufferError: # Views of the state still alive; the mapping goes with them
+        pass
+    memory.unlink()
+
+def _release(pool, memories):
+    pool.terminate()
+    for memory in memories:
+        _release_memory(memory)
+
+class ShardedStateVector:
+    """
+    A state vector in multiprocessing.shared_memory, split across `workers`
+    processes (a power of two) on its leading qubits: worker shard s holds
+    the contiguous amplitudes whose top log2(workers) qubits spell s.
+
+    Runs of blocks acting only on the remaining (local) qubits are applied
+    to every shard in parallel, one task per shard. A block on a top
+    (shard) qubit is applied by pairing the shards that differ in that bit,
+    each pair exchanging amplitudes through the shared buffer, with the
+    pairs processed in parallel. Both paths use the same NumPy kernel as
+    the single-process simulator.
+
+    `state` is a writable view of the shared buffer. reset() returns to
+    |0...0>, of the same or another width, keeping the worker processes.
+    Call close() (or use the object as a context manager) to stop the
+    workers and free the buffer.
+    """
+    def __init__(self, num_qubits, workers, dtype=np.complex64):
+        if workers < 1 or workers & (workers - 1):
+            raise ValueError(f"workers must be a power of two, got {workers}")
+        self.workers = workers
+        self.dtype = np.dtype(dtype)
+        self._memories = [] # The current shared buffer, for the finalizer
+        self.num_qubits = None
+        # Allocate before forking: workers must share this process's resource tracker,
+        # or their own trackers would unlink the buffers they attached to on exit
+        self.reset(num_qubits)
+        self._pool = multiprocessing.Pool(workers)
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._memories)
+
+    def reset(self, num_qubits=None):
+        """
+        Resets the state to |0...0> on num_qubits qubits (default: unchanged).
+        The buffer is reused when the width is unchanged; otherwise it is
+        replaced and the workers map the new one on their next task.
+        """
+        num_qubits = self.num_qubits if num_qubits is None else num_qubits
+        if num_qubits != self.num_qubits:
+            self.state = None
+            if self._memories:
+                _release_memory(self._memories.pop())
+            memory = shared_memory.SharedMemory(create=True, size=2**num_qubits * self.dtype.itemsize)
+            self._memories.append(memory)
+            self.num_qubits = num_qubits
+            self.shard_qubits = min(int(np.log2(self.workers)), num_qubits)
+            self.state = np.ndarray((2**num_qubits,), dtype=self.dtype, buffer=memory.buf)
+            self._layout = (memory.name, num_qubits, self.dtype, self.shard_qubits)
+        self.state[:] = 0
+        self.state[0] = 1.0
+
+    def apply_blocks(self, blocks):
+        """
+        Applies (axes, unitary tensor) blocks in order. Consecutive blocks
+        on the same shard qubits are sent to the workers as one task each.
+        """
+        run, run_lead = [], None
+        for axes, unitary in blocks:
+            lead = sorted(a for a in axes if a < self.shard_qubits)
+            if run and lead != run_lead:
+                self._dispatch(run_lead, run)
+                run = []
+            run.append((axes, unitary))
+            run_lead = lead
+        if run:
+            self._dispatch(run_lead, run)
+
+    def _dispatch(self, lead, blocks):
+        groups = np.ndindex(*(2,) * (self.shard_qubits - len(lead)))
+        self._pool.map(_apply_to_group, [(self._layout, lead, bits, blocks) for bits in groups])
+
+    def get_marginals(self, qubits=None):
+        """P(q_k = 1) for the given qubit indices (default: all), each shard reduced by its worker."""
+        qubits = list(range(self.num_qubits) if qubits is None else qubits)
+        tasks = [(self._layout, shard, qubits) for shard in range(2**self.shard_qubits)]
+        return np.sum(self._pool.map(_shard_marginals, tasks), axis=0)
+
+    def close(self):
+        """Stops the workers and releases the shared buffer."""
+        self.state = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
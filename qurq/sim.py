@@ -2,21 +2,98 @@ import numpy as np
 import cirq
 import json
 import os
-from q_os.sphy_generator import get_regularized_sphy_waves, get_sphy_wave_from_quantum_state
+import tempfile
+import uuid
+from q_os.sphy_generator import (
+    get_regularized_sphy_waves, get_sphy_wave_from_quantum_state, get_sphy_wave_from_lacing,
+    get_sphy_waves_from_quantum_states,
+    get_qubit_marginals, get_harmonic_basis, COMPACT_WAVE_SPEC, QUDIT_LACING_THRESHOLD
+)
+from .kernels import (
+    apply_blocks, apply_unitary, apply_unitary_batched,
+    operation_unitary, sweep_unitaries, apply_channel_batched
+)
+from .memmap_state import (
+    create_memmap_state, apply_unitary_chunked, apply_moment_chunked,
+    get_qubit_marginals_chunked, get_joint_distribution_chunked, CHUNK_SIZE
+)
+from .sharded import ShardedStateVector
+from .stabilizer import StabilizerTableau
+from .ops import json_resolver
+from .compiler import compile_circuit
+
+# In-memory state vector budget, in bytes (14 qubits of complex64 amplitudes).
+# Wider circuits are simulated on a memory-mapped state vector (see qurq.memmap_state).
+STATE_MEMORY = 2**14 * np.dtype(np.complex64).itemsize
+
+# Moments between state-vector checkpoints kept for step_back()/jump_to()
+CHECKPOINT_INTERVAL = 16
+# Memory budget for those checkpoints, in bytes
+CHECKPOINT_MEMORY = 64 * 2**20
 
 class MimeticSimulator:
     """
     Simulates the execution of a Cirq circuit with mimetic SPHY wave modulation.
     Supports step-by-step execution and state inspection.
+    SPHY waves are kept as compact 12-bit uint16 tables (see WaveSpec);
+    pass spec=SINGLE_PRECISION_WAVE_SPEC to also synthesize them in float32,
+    matching the complex64 state vector.
+
+    lacing_threshold is the widest circuit rendered in Full Hyperposition
+    mode; wider circuits use Qudit Lacing (see get_sphy_wave_from_quantum_state).
+
+    Every checkpoint_interval moments (and after every non-unitary moment) a
+    copy of the state vector is kept as a checkpoint, within
+    checkpoint_memory bytes (oldest evicted first), so step_back() and
+    jump_to(k) only replay from the nearest checkpoint.
+
+    State vectors larger than state_memory bytes are kept in an np.memmap
+    (in storage_dir, default: the system temp directory) and updated in
+    chunks of chunk_size amplitudes, up to MAX_MEMMAP_QUBITS qubits.
+
+    With workers > 1 (a power of two), in-memory state vectors are sharded
+    across that many processes (see qurq.sharded.ShardedStateVector), which
+    pays off from about 20 qubits; raise state_memory accordingly and call
+    close() when done to stop the workers.
+
+    Clifford-only circuits (H, S, X, Y, Z, CNOT, CZ, SWAP, Stabilize and
+    measurements) whose state vector would exceed state_memory run on a
+    bit-packed stabilizer tableau instead (see qurq.stabilizer), with the
+    Qudit Lacing marginals read from the tableau, so they can span hundreds
+    of qubits.
     """
-    def __init__(self):
+    def __init__(self, lacing_threshold=QUDIT_LACING_THRESHOLD, spec=COMPACT_WAVE_SPEC,
+                 checkpoint_interval=CHECKPOINT_INTERVAL, checkpoint_memory=CHECKPOINT_MEMORY,
+                 state_memory=STATE_MEMORY, chunk_size=CHUNK_SIZE, storage_dir=None, workers=1):
+        self._lacing_threshold = lacing_threshold
+        self._spec = spec
+        self._state_memory = state_memory
+        self._chunk_size = chunk_size
+        self._storage_dir = storage_dir
+        self._memmapped = False
+        self._workers = workers
+        self._sharded = None # ShardedStateVector holding the state, if sharded
+        self._tableau = None # StabilizerTableau replacing the state vector, for wide Clifford circuits
+        self._rng = np.random.default_rng()
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoint_memory = checkpoint_memory
+        self._checkpoints = {} # step -> state vector after that many moments, in insertion order
+        self._max_checkpoints = 0
         self._circuit = None
+        self._circuit_json = None
+        self._plan = None # CircuitPlan of the loaded circuit
         self._qubits = []
         self._num_qubits = 0
         self._state_vector = None
         self._current_step = 0
-        self._sphy_waves = get_regularized_sphy_waves() # Default SPHY wave, will be updated by state_vector
+        self._sphy_waves = get_regularized_sphy_waves(spec=self._spec) # Default SPHY wave, will be updated by state_vector
         self._current_gate_info = "Initial State"
+        self._version = 0 # Bumped on every change visible in the debug info
+        self._debug_info = None # (version, debug info dict), built on demand
+        self._debug_info_json = None # (version, UTF-8 JSON of that dict)
+        self._qubit_index = {}
+        self._marginals = None # P(q_k = 1) per qubit, kept in sync with the state vector
+        self._lacing_sum = None # sum_k P(q_k = 1) * sin((k+1)x), Qudit Lacing mode only
 
     def load_circuit(self, circuit: cirq.Circuit):
         """
@@ -24,18 +101,52 @@ class MimeticSimulator:
         Initializes the simulator to the |0...0> state.
         """
         self._circuit = circuit
-        self._qubits = sorted(circuit.all_qubits())
+        self._circuit_json = None # cirq JSON of the circuit, built on first save_state
+        # Compiled once per distinct circuit structure (see qurq.compiler); step(),
+        # run() and jump_to() follow the plan's moments (see _sync_plan)
+        self._plan = compile_circuit(circuit, np.complex64)
+        self._planned_moments = tuple(circuit.moments)
+        self._qubits = list(self._plan.qubits)
         self._num_qubits = len(self._qubits)
-        if self._num_qubits > 14: # Limit for state vector simulation efficiency (approx laptop limit)
-            raise ValueError("Circuit too large for state vector simulation (max 14 qubits).")
-        
-        # Initialize state vector to |0...0>
-        self._state_vector = np.zeros(2**self._num_qubits, dtype=np.complex64)
-        self._state_vector[0] = 1.0 # Set |00...0> state
+        self._qubit_index = self._plan.qubit_index
+
+        # Initialize state vector to |0...0>, memory-mapped beyond the in-memory budget
+        self._tableau = None
+        self._memmapped = 2**self._num_qubits * np.dtype(np.complex64).itemsize > self._state_memory
+        sharded = not self._memmapped and self._workers > 1
+        if not sharded:
+            self.close()
+        if self._memmapped and self._num_qubits > self._lacing_threshold and self._plan.is_clifford:
+            self._memmapped = False
+            self._tableau = StabilizerTableau(self._num_qubits)
+            self._state_vector = None
+        elif self._memmapped:
+            self._state_vector = create_memmap_state(self._num_qubits, np.complex64, self._storage_dir)
+        elif sharded:
+            # Reloads keep the worker processes; only the shared buffer is reset (or resized)
+            self._state_vector = None
+            if self._sharded is None:
+                self._sharded = ShardedStateVector(self._num_qubits, self._workers, np.complex64)
+            else:
+                self._sharded.reset(self._num_qubits)
+            self._state_vector = self._sharded.state
+        else:
+            self._state_vector = np.zeros(2**self._num_qubits, dtype=np.complex64)
+            self._state_vector[0] = 1.0 # Set |00...0> state
         
         self._current_step = 0
-        self._sphy_waves = get_sphy_wave_from_quantum_state(self._state_vector, self._num_qubits) # Initial SPHY wave
-        self._current_gate_info = "Circuit Loaded"
+        self._checkpoints = {}
+        state_bytes = self._tableau.nbytes if self._tableau is not None else self._state_vector.nbytes
+        self._max_checkpoints = self._checkpoint_memory // state_bytes
+        self._current_gate_info = "Circuit Loaded" # Before the wave bumps the version
+        self._refresh_sphy_waves() # Initial SPHY wave
+
+    def close(self):
+        """Stops (terminates) the worker processes of a sharded state vector, if any."""
+        if self._sharded is not None:
+            self._state_vector = None
+            self._sharded.close()
+            self._sharded = None
 
     def reset(self):
         """Resets the simulator to the initial |0...0> state of the loaded circuit."""
@@ -44,8 +155,39 @@ class MimeticSimulator:
         else:
             self._state_vector = None
             self._current_step = 0
-            self._sphy_waves = get_regularized_sphy_waves() # Fallback if no circuit loaded
+            self._sphy_waves = get_regularized_sphy_waves(spec=self._spec) # Fallback if no circuit loaded
             self._current_gate_info = "Simulator Reset"
+            self._bump_version()
+
+    def _sync_plan(self):
+        """
+        Recompiles the plan if the loaded circuit was modified since it was
+        compiled (e.g. operations appended to it). Checkpoints past the first
+        changed moment are dropped; moments already applied are not replayed.
+        Raises ValueError if the circuit's qubits or (on the tableau) its
+        Clifford-ness changed. Returns False if no circuit with moments is loaded.
+        """
+        if not self._circuit:
+            return False
+        moments = tuple(self._circuit.moments)
+        planned = self._planned_moments
+        if len(moments) == len(planned) and all(a is b for a, b in zip(moments, planned)):
+            return True
+
+        plan = compile_circuit(self._circuit, np.complex64)
+        if plan.qubits != self._plan.qubits:
+            raise ValueError("The circuit's qubits changed since it was loaded; load it again")
+        if self._tableau is not None and not plan.is_clifford:
+            raise ValueError("A non-Clifford operation was added to a circuit simulated on the tableau; load it again")
+        changed = next(
+            (i for i, (a, b) in enumerate(zip(moments, planned)) if a is not b), min(len(moments), len(planned))
+        )
+        self._drop_checkpoints_after(changed)
+        self._plan = plan
+        self._planned_moments = moments
+        self._circuit_json = None
+        self._bump_version() # The debug info's step count follows the plan
+        return True
 
     def step(self):
         """
@@ -53,38 +195,416 @@ class MimeticSimulator:
         Applies gates, updates state vector, and generates corresponding SPHY waves from state.
         Returns True if a step was performed, False if end of circuit.
         """
-        if not self._circuit or self._current_step >= len(self._circuit):
+        if not self._sync_plan() or self._current_step >= len(self._plan.moments):
             self._current_gate_info = "End of Circuit"
+            self._bump_version()
             return False
 
-        moment = self._circuit[self._current_step]
+        moment = self._plan.moments[self._current_step]
         self._current_gate_info = f"Applying moment {self._current_step}: {moment!s}"
 
-        # Use Cirq's simulator to apply the moment to the current state vector
-        # This handles the unitary construction and application internally, respecting qubit order.
-        simulator = cirq.Simulator()
-        
-        # Create a new circuit with just the current moment
-        moment_circuit = cirq.Circuit(moment)
-        
-        # Simulate the moment, starting from the current state vector
-        # This will correctly evolve the state vector for the qubits in the circuit.
-        # We need to explicitly pass the qubit_order to ensure consistency.
-        result = simulator.simulate(moment_circuit, initial_state=self._state_vector, qubit_order=self._qubits)
-        self._state_vector = result.final_state_vector
+        # Always generate SPHY wave from the current quantum state.
+        self._refresh_sphy_waves(self._apply_next_moment())
+        return True
 
+    def _apply_next_moment(self):
+        """
+        Applies the moment at the current step to the state vector, advances
+        the step and records a checkpoint when one is due. Returns the sorted
+        indices of the qubits whose marginals may have changed (None: all).
+        """
+        step = self._current_step
+        moment = self._plan.moments[step]
+        # A unitary moment can only change the marginals of the qubits it acts on
+        touched = self._plan.touched[step]
+
+        if self._tableau is not None:
+            if self._tableau.apply_moment(moment, self._qubit_index, self._rng):
+                return self._finish_moment(touched)
+            return self._finish_moment(None)
+        if self._sharded is not None and self._plan.unitary_moments[step]:
+            self._sharded.apply_blocks(self._plan.operations[step])
+            return self._finish_moment(touched)
+        if self._memmapped:
+            if apply_moment_chunked(self._state_vector, moment, self._qubit_index, self._rng, self._chunk_size):
+                return self._finish_moment(touched)
+            return self._finish_moment(None)
 
-        # Always generate SPHY wave from the current quantum state
-        self._sphy_waves = get_sphy_wave_from_quantum_state(self._state_vector, self._num_qubits)
+        # Unitary moments are applied natively on the state tensor with the plan's
+        # precompiled unitaries (see qurq.kernels), respecting the sorted qubit order;
+        # anything else (e.g. a measurement) goes through Cirq's simulator.
+        if self._plan.unitary_moments[step]:
+            self._state_vector = apply_blocks(self._state_vector, self._plan.operations[step], self._num_qubits)
+        else:
+            result = cirq.Simulator().simulate(
+                cirq.Circuit(moment), initial_state=self._state_vector, qubit_order=self._qubits
+            )
+            self._set_state(result.final_state_vector)
+            # A non-unitary moment (e.g. a measurement collapsing an entangled partner) refreshes all marginals
+            touched = None
+        return self._finish_moment(touched)
 
+    def _finish_moment(self, touched):
+        """Advances the step after a moment was applied and records a checkpoint when one is due."""
         self._current_step += 1
+        if touched is None:
+            # The outcome may differ from earlier passes: later checkpoints are stale
+            self._drop_checkpoints_after(self._current_step - 1)
+            self._save_checkpoint()
+        elif self._current_step % self._checkpoint_interval == 0:
+            self._save_checkpoint()
+        return touched
+
+    def _save_checkpoint(self):
+        """Keeps an in-memory copy of the state vector for the current step, evicting the oldest checkpoint if full."""
+        if self._current_step in self._checkpoints or self._max_checkpoints == 0:
+            return
+        if len(self._checkpoints) >= self._max_checkpoints:
+            del self._checkpoints[next(iter(self._checkpoints))]
+        if self._tableau is not None:
+            self._checkpoints[self._current_step] = self._tableau.copy()
+        else:
+            self._checkpoints[self._current_step] = np.array(self._state_vector)
+
+    def _set_state(self, state_vector):
+        """Replaces the state vector; memory-mapped and shared buffers are overwritten in place."""
+        if self._memmapped or self._sharded is not None:
+            self._state_vector[:] = state_vector
+        else:
+            self._state_vector = state_vector
+
+    def _drop_checkpoints_after(self, step):
+        """Discards the checkpoints recorded beyond the given step."""
+        for stale in [s for s in self._checkpoints if s > step]:
+            del self._checkpoints[stale]
+
+    def jump_to(self, step):
+        """
+        Moves the simulation to just after the first `step` moments.
+
+        The nearest checkpoint at or before `step` (or |0...0>) is restored,
+        unless the current step is closer, and the remaining moments are
+        replayed without intermediate SPHY waves. Replayed measurements are
+        sampled again. Returns True if the simulator moved.
+        """
+        if not self._sync_plan():
+            return False
+        if not 0 <= step <= len(self._plan.moments):
+            raise ValueError(f"Step {step} out of range (0-{len(self._plan.moments)})")
+
+        nearest = max((s for s in self._checkpoints if s <= step), default=0)
+        if step < self._current_step or nearest > self._current_step:
+            if self._tableau is not None:
+                self._tableau = self._checkpoints[nearest].copy() if nearest else StabilizerTableau(self._num_qubits)
+            elif nearest:
+                self._set_state(self._checkpoints[nearest].copy())
+            elif self._memmapped or self._sharded is not None:
+                # Overwrite the mapped file or shared buffer in place rather than allocating a new state
+                self._state_vector[:] = 0
+                self._state_vector[0] = 1.0
+            else:
+                self._state_vector = np.zeros_like(self._state_vector)
+                self._state_vector[0] = 1.0
+            self._current_step = nearest
+
+        while self._current_step < step:
+            self._apply_next_moment()
+        self._current_gate_info = f"Jumped to step {step}"
+        self._refresh_sphy_waves()
         return True
 
+    def step_back(self):
+        """
+        Moves the simulation back by one moment (see jump_to).
+        Returns True if a step was undone, False at the start of the circuit.
+        """
+        if not self._circuit or self._current_step == 0:
+            return False
+        return self.jump_to(self._current_step - 1)
+
+    def run(self):
+        """
+        Applies all remaining moments in one go and returns how many were applied.
+
+        Consecutive unitary moments are fused into blocks of at most two qubits
+        (see qurq.kernels.fuse_operations), and no intermediate SPHY waves or
+        debug info are produced: the wave is synthesized once, at the end.
+        """
+        if not self._sync_plan() or self._current_step >= len(self._plan.moments):
+            self._current_gate_info = "End of Circuit"
+            self._bump_version()
+            return 0
+
+        start = self._current_step
+        if self._tableau is not None:
+            # Tableau updates are already O(n) per gate: nothing to fuse
+            diverged = False
+            for moment in self._plan.moments[start:]:
+                diverged |= not self._tableau.apply_moment(moment, self._qubit_index, self._rng)
+            return self._finish_run(start, diverged)
+
+        pending = start # First unitary moment not yet applied
+        diverged = False # A non-unitary moment may have changed the outcome of later moments
+        for step in range(start, len(self._plan.moments)):
+            if self._plan.unitary_moments[step]:
+                continue
+            self._apply_fused(pending, step)
+            pending = step + 1
+            moment = self._plan.moments[step]
+            if self._memmapped:
+                apply_moment_chunked(self._state_vector, moment, self._qubit_index, self._rng, self._chunk_size)
+            else:
+                result = cirq.Simulator().simulate(
+                    cirq.Circuit(moment), initial_state=self._state_vector, qubit_order=self._qubits
+                )
+                self._set_state(result.final_state_vector)
+            diverged = True
+        self._apply_fused(pending, len(self._plan.moments))
+        return self._finish_run(start, diverged)
+
+    def _finish_run(self, start, diverged):
+        """Bookkeeping once run() applied every moment from start: checkpoint and a single final wave."""
+        self._current_step = len(self._plan.moments)
+        if diverged:
+            self._drop_checkpoints_after(start)
+        self._save_checkpoint()
+        self._current_gate_info = f"Ran moments {start}-{self._current_step - 1}"
+        self._refresh_sphy_waves()
+        return self._current_step - start
+
+    def _apply_fused(self, start, stop):
+        """Applies the unitary moments start..stop-1, fused into blocks of at most two qubits (cached by the plan)."""
+        if start >= stop:
+            return
+        blocks = self._plan.fused_blocks(start, stop)
+        if self._sharded is not None:
+            self._sharded.apply_blocks(blocks)
+        elif self._memmapped:
+            for axes, unitary in blocks:
+                apply_unitary_chunked(self._state_vector, unitary, axes, self._num_qubits, self._chunk_size)
+        else:
+            self._state_vector = apply_blocks(self._state_vector, blocks, self._num_qubits)
+
+    def _get_marginals(self, qubits=None):
+        """P(q_k = 1) for the given qubit indices (default: all), streamed over chunks or shards."""
+        if self._tableau is not None:
+            return self._tableau.get_marginals(qubits)
+        if self._sharded is not None:
+            return self._sharded.get_marginals(qubits)
+        if self._memmapped:
+            return get_qubit_marginals_chunked(self._state_vector, self._num_qubits, qubits, self._chunk_size)
+        return get_qubit_marginals(self._state_vector, self._num_qubits, qubits=qubits)
+
+    def _refresh_sphy_waves(self, touched=None):
+        """
+        Regenerates the SPHY wave after the state vector changed.
+
+        touched lists the indices of the qubits whose marginals may have
+        changed (None: all of them). Only those marginals are recomputed, and
+        in Qudit Lacing mode only their harmonic terms of the running lacing
+        sum are updated before the final normalization, so a moment acting on
+        one or two qubits costs the same regardless of circuit width.
+        """
+        n = self._num_qubits
+        lacing = n > self._lacing_threshold
+        if lacing:
+            basis = get_harmonic_basis(self._spec.points, n, self._spec.float_dtype)[0]
+
+        if touched is None:
+            self._marginals = self._get_marginals()
+            if lacing:
+                self._lacing_sum = self._marginals @ basis
+        elif touched:
+            updated = self._get_marginals(touched)
+            if lacing:
+                self._lacing_sum += (updated - self._marginals[touched]) @ basis[touched]
+            self._marginals[touched] = updated
+
+        if lacing:
+            self._sphy_waves = get_sphy_wave_from_lacing(self._lacing_sum, n, spec=self._spec)
+        else:
+            self._sphy_waves = get_sphy_wave_from_quantum_state(
+                self._state_vector, n, spec=self._spec, lacing_threshold=self._lacing_threshold
+            )
+        self._bump_version()
+
+    def _bump_version(self):
+        """Marks the debug info as changed; cached snapshots of older versions are rebuilt on demand."""
+        self._version += 1
+
+    @property
+    def version(self):
+        """Counter bumped on every change of the state, step, waves or gate info."""
+        return self._version
+
+    def sample(self, repetitions, qubits=None, seed=None):
+        """
+        Draws shots from the current state without collapsing it.
+
+        qubits (default: all, in sorted order) selects the measured qubits;
+        the other qubits are summed out first. Shots are drawn in one
+        vectorized pass: uniform variates are located in the cumulative
+        distribution with searchsorted, then packed and histogrammed
+        (np.bincount) without a per-bit or sorted copy. Returns a dictionary with:
+        - 'qubits': names of the measured qubits, most significant bit first;
+        - 'packed_bits': (repetitions x ceil(k/8)) uint8 array of np.packbits
+          rows, one per shot (unpack with np.unpackbits(..., axis=1, count=k));
+        - 'outcomes' / 'counts': the distinct outcomes as integers (first
+          qubit is the most significant bit) and how often each was drawn.
+        """
+        if self._tableau is not None:
+            raise ValueError("Sampling needs a state vector; this circuit runs on a stabilizer tableau")
+        if self._state_vector is None:
+            raise ValueError("No circuit loaded")
+        qubits = self._qubits if qubits is None else list(qubits)
+        axes = [self._qubit_index[q] for q in qubits]
+        rng = self._rng if seed is None else np.random.default_rng(seed)
+
+        chunk_size = self._chunk_size if self._memmapped else len(self._state_vector)
+        cdf = np.cumsum(get_joint_distribution_chunked(self._state_vector, self._num_qubits, axes, chunk_size).reshape(-1))
+        shots = np.searchsorted(cdf, rng.random(repetitions) * cdf[-1], side="right")
+        np.minimum(shots, len(cdf) - 1, out=shots) # Guard against rounding at the top of the CDF
+
+        counts = np.bincount(shots, minlength=len(cdf))
+        outcomes = np.flatnonzero(counts)
+
+        # Pack the shots byte by byte, padded at the end like np.packbits, without a per-bit matrix
+        num_bytes = (len(axes) + 7) // 8
+        shots <<= 8 * num_bytes - len(axes)
+        packed = np.empty((repetitions, num_bytes), dtype=np.uint8)
+        byte = np.empty_like(shots)
+        for j in range(num_bytes):
+            np.right_shift(shots, 8 * (num_bytes - 1 - j), out=byte)
+            np.bitwise_and(byte, 0xFF, out=byte)
+            packed[:, j] = byte
+        return {
+            "qubits": [str(q) for q in qubits],
+            "packed_bits": packed,
+            "outcomes": outcomes,
+            "counts": counts[outcomes],
+        }
+
+    def simulate_sweep(self, circuit, params):
+        """
+        Simulates a parameterized unitary circuit for every resolver of a sweep at once.
+
+        params is anything cirq.to_resolvers accepts (a cirq.Sweep, a list of
+        ParamResolvers or dicts, ...). All sweep points are evolved together
+        as one (sweep x 2^n) complex64 state tensor: unparameterized gates are
+        applied to the whole batch with one shared unitary, parameterized ones
+        with their per-point unitaries in a single batched matmul. The loaded
+        circuit and debugger state are left untouched (see
+        qurq.kernels.sweep_unitaries for how per-point unitaries are built).
+
+        Returns a dictionary with 'state_vectors' (sweep x 2^n), 'marginals'
+        (sweep x n) and 'sphy_waves' (sweep x points), rows in sweep order.
+        """
+        resolvers = list(cirq.to_resolvers(params))
+        qubits = sorted(circuit.all_qubits())
+        num_qubits = len(qubits)
+        qubit_index = {q: i for i, q in enumerate(qubits)}
+        if 2**num_qubits * np.dtype(np.complex64).itemsize > self._state_memory:
+            raise ValueError(f"Sweeps need in-memory state vectors ({num_qubits} qubits exceed state_memory).")
+
+        states = np.zeros((len(resolvers),) + (2,) * num_qubits, dtype=np.complex64)
+        states.reshape(len(resolvers), -1)[:, 0] = 1.0
+        sweep_cache = {}
+        for op in circuit.all_operations():
+            axes = [qubit_index[q] for q in op.qubits]
+            if not cirq.is_parameterized(op):
+                unitary = operation_unitary(op, states.dtype)
+                if unitary is None:
+                    raise ValueError(f"Sweeps support unitary circuits only, got {op}")
+                states = apply_unitary(states, unitary, [1 + a for a in axes])
+                continue
+
+            key = op.gate if op.gate is not None else op
+            if key not in sweep_cache: # e.g. rz(theta) on every qubit shares its sweep unitaries
+                sweep_cache[key] = sweep_unitaries(op, resolvers, states.dtype)
+            unitaries = sweep_cache[key]
+            if unitaries is None:
+                raise ValueError(f"Sweeps support unitary circuits only, got {op}")
+            states = apply_unitary_batched(states, unitaries, axes)
+
+        state_vectors = np.ascontiguousarray(states).reshape(len(resolvers), -1)
+        return {
+            "state_vectors": state_vectors,
+            "marginals": get_qubit_marginals(state_vectors, num_qubits),
+            "sphy_waves": get_sphy_waves_from_quantum_states(
+                state_vectors, num_qubits, spec=self._spec, lacing_threshold=self._lacing_threshold
+            ),
+        }
+
+    def simulate_trajectories(self, circuit, repetitions, noise=None, seed=None):
+        """
+        Monte Carlo (quantum trajectory) simulation of a noisy circuit.
+
+        Runs `repetitions` noisy copies of the state as one stacked
+        (repetitions x 2^n) complex64 array, so decoherence studies need
+        repetitions * 2^n amplitudes rather than a 4^n density matrix.
+        Channels can be part of the circuit (cirq.depolarize, cirq.phase_damp,
+        cirq.amplitude_damp, ...) and/or added after every moment with noise,
+        anything circuit.with_noise accepts (a cirq.NoiseModel or a channel
+        such as cirq.depolarize(0.01)). Each channel picks one Kraus branch
+        per trajectory in a vectorized draw (see
+        qurq.kernels.apply_channel_batched); measurements collapse each
+        trajectory independently. The loaded circuit is left untouched.
+
+        Returns a dictionary with 'state_vectors' (repetitions x 2^n),
+        'marginals' (n,) averaged over trajectories (the noisy channel's
+        marginals), 'sphy_waves' (repetitions x points), one wave per
+        trajectory, and 'mean_sphy_wave' (points,), their average.
+        """
+        if noise is not None:
+            circuit = circuit.with_noise(noise)
+        qubits = sorted(circuit.all_qubits())
+        num_qubits = len(qubits)
+        qubit_index = {q: i for i, q in enumerate(qubits)}
+        if 2**num_qubits * np.dtype(np.complex64).itemsize > self._state_memory:
+            raise ValueError(f"Trajectories need in-memory state vectors ({num_qubits} qubits exceed state_memory).")
+        rng = self._rng if seed is None else np.random.default_rng(seed)
+
+        states = np.zeros((repetitions,) + (2,) * num_qubits, dtype=np.complex64)
+        states.reshape(repetitions, -1)[:, 0] = 1.0
+        for op in circuit.all_operations():
+            axes = [qubit_index[q] for q in op.qubits]
+            unitary = operation_unitary(op, states.dtype)
+            if unitary is not None:
+                states = apply_unitary(states, unitary, [1 + a for a in axes])
+            else:
+                states = apply_channel_batched(states, op, axes, rng)
+
+        state_vectors = np.ascontiguousarray(states).reshape(repetitions, -1)
+        waves = get_sphy_waves_from_quantum_states(
+            state_vectors, num_qubits, spec=self._spec, lacing_threshold=self._lacing_threshold
+        )
+        return {
+            "state_vectors": state_vectors,
+            "marginals": get_qubit_marginals(state_vectors, num_qubits).mean(axis=0),
+            "sphy_waves": waves,
+            "mean_sphy_wave": np.rint(waves.mean(axis=0)).astype(self._spec.dtype),
+        }
+
     def get_current_debug_info(self):
         """
         Returns a dictionary with current debug information.
+        The dictionary is built once per version and shared: do not modify it.
         """
-        if self._state_vector is None:
+        if self._debug_info is None or self._debug_info[0] != self._version:
+            self._debug_info = (self._version, self._build_debug_info())
+        return self._debug_info[1]
+
+    def get_debug_info_json(self):
+        """
+        Returns (version, payload): the debug info encoded as UTF-8 JSON,
+        encoded once per version so repeated polls reuse the same bytes.
+        """
+        if self._debug_info_json is None or self._debug_info_json[0] != self._version:
+            self._debug_info_json = (self._version, json.dumps(self.get_current_debug_info()).encode())
+        return self._debug_info_json
+
+    def _build_debug_info(self):
+        if self._state_vector is None and self._tableau is None:
             return {
                 "status": "No Circuit Loaded",
                 "current_step": -1,
@@ -94,24 +614,16 @@ class MimeticSimulator:
                 "current_gate_info": self._current_gate_info
             }
 
-        probabilities = np.abs(self._state_vector)**2
-        qubit_prob_map = {}
-        for i in range(self._num_qubits):
-            # For each qubit, sum probabilities where that qubit is in state 1
-            prob_one = 0
-            for j in range(len(probabilities)):
-                # Check if the i-th qubit is 1 in this basis state
-                if (j >> (self._num_qubits - 1 - i)) & 1:
-                    prob_one += probabilities[j]
-            qubit_prob_map[str(self._qubits[i])] = {
-                "0": float(round(1 - prob_one, 4)),
-                "1": float(round(prob_one, 4))
-            }
-        
+        marginals = self._marginals.astype(np.float64)
+        qubit_prob_map = {
+            str(q): {"0": p0, "1": p1}
+            for q, p0, p1 in zip(self._qubits, np.round(1 - marginals, 4).tolist(), np.round(marginals, 4).tolist())
+        }
+
         return {
-            "status": "Running" if self._current_step < len(self._circuit) else "Finished",
+            "status": "Running" if self._current_step < len(self._plan.moments) else "Finished",
             "current_step": self._current_step,
-            "total_steps": len(self._circuit),
+            "total_steps": len(self._plan.moments),
             "qubit_probabilities": qubit_prob_map,
             "sphy_waves": self._sphy_waves.tolist(),
             "current_gate_info": self._current_gate_info
@@ -119,19 +631,56 @@ class MimeticSimulator:
 
     def save_state(self, filepath):
         """
-        Saves the current simulation state (SPHY waves only for now) to disk.
+        Saves a snapshot of the session to filepath (JSON) and, next to it,
+        the complex64 state vector as a raw .npy file (see snapshot_path).
+
+        The JSON holds the SPHY waves, qubit marginals, step, gate info and
+        the loaded circuit (cirq JSON, serialized once per circuit). Every
+        save writes its state vector under a new generation id, which the
+        JSON records; the JSON is renamed into place last, so it always
+        names a complete state file of the same save and a crash keeps the
+        previous snapshot intact. The state file of the snapshot it replaces
+        is then removed.
+        Tableau-backed sessions store no state vector and are replayed on
+        load; circuits that cirq cannot serialize (e.g. custom gates without
+        JSON support) are saved without circuit or state.
         """
         state = {
             "sphy_waves": self._sphy_waves.tolist(),
             "current_step": self._current_step,
             "current_gate_info": self._current_gate_info
         }
-        with open(filepath, 'w') as f:
-            json.dump(state, f)
+        if self._marginals is not None:
+            state["marginals"] = self._marginals.tolist()
+        if self._circuit is not None and self._circuit_json is None:
+            try:
+                self._circuit_json = cirq.to_json(cirq.Circuit.from_moments(*self._circuit), indent=None)
+            except (ValueError, TypeError) as e:
+                print(f"Circuit not serializable, saving the session without it: {e}")
+                self._circuit_json = False # Not retried for this circuit
+        previous = _saved_generation(filepath)
+        if self._circuit is not None and self._circuit_json:
+            state["circuit"] = self._circuit_json
+            if self._state_vector is not None:
+                state["state_generation"] = uuid.uuid4().hex
+                state_path = snapshot_path(filepath, state["state_generation"])
+                _write_atomically(state_path, lambda f: np.save(f, self._state_vector))
+        _write_atomically(filepath, lambda f: f.write(json.dumps(state).encode()))
+
+        if previous is not None:
+            try:
+                os.unlink(snapshot_path(filepath, previous))
+            except FileNotFoundError:
+                pass
 
     def load_state(self, filepath):
         """
-        Loads the simulation state from disk.
+        Loads a snapshot written by save_state, resuming the circuit and state
+        vector where it left off. The state vector is mapped copy-on-write
+        (np.load with mmap_mode='c') and the saved marginals are reused, so
+        loading an in-memory session reads no amplitudes up front and never
+        modifies the file. Snapshots without a circuit restore the
+        waves, step and gate info only.
         """
         if not os.path.exists(filepath):
             return False
@@ -139,14 +688,64 @@ class MimeticSimulator:
         try:
             with open(filepath, 'r') as f:
                 state = json.load(f)
-            
+
+            if "circuit" in state:
+                circuit = cirq.read_json(json_text=state["circuit"], resolvers=[json_resolver, *cirq.DEFAULT_RESOLVERS])
+                self.load_circuit(circuit)
+                self._circuit_json = state["circuit"]
+                state_path = snapshot_path(filepath, state["state_generation"]) if "state_generation" in state else None
+                self._restore_state_vector(state_path, state.get("current_step", 0), state.get("marginals"))
             if "sphy_waves" in state:
-                self._sphy_waves = np.array(state["sphy_waves"])
+                self._sphy_waves = np.array(state["sphy_waves"], dtype=self._spec.dtype)
             if "current_step" in state:
                 self._current_step = state["current_step"]
             if "current_gate_info" in state:
                 self._current_gate_info = state["current_gate_info"]
+            self._bump_version()
             return True
         except Exception as e:
             print(f"Failed to load state: {e}")
             return False
+
+    def _restore_state_vector(self, path, step, marginals=None):
+        """Maps a saved state vector for the given step, or replays the circuit up to it if there is none."""
+        saved = np.load(path, mmap_mode="c") if path is not None and os.path.exists(path) else None
+        if saved is None or saved.shape != (2**self._num_qubits,) or self._tableau is not None:
+            self.jump_to(step)
+            return
+        if self._memmapped or self._sharded is not None:
+            self._state_vector[:] = saved
+        else:
+            self._state_vector = saved.view(np.ndarray)
+        self._current_step = step
+        if marginals is not None and len(marginals) == self._num_qubits:
+            self._marginals = np.array(marginals, dtype=self._marginals.dtype)
+            if self._num_qubits > self._lacing_threshold:
+                self._lacing_sum = self._marginals @ get_harmonic_basis(
+                    self._spec.points, self._num_qubits, self._spec.float_dtype)[0]
+        else:
+            self._refresh_sphy_waves()
+
+def snapshot_path(filepath, generation):
+    """Path of the binary state vector of one save_state generation, stored alongside the snapshot."""
+    return f"{os.path.splitext(filepath)[0]}.{generation}.npy"
+
+def _saved_generation(filepath):
+    """The state_generation recorded by the snapshot at filepath, or None."""
+    try:
+        with open(filepath) as f:
+            return json.load(f).get("state_generation")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _write_atomically(path, write):
+    """Writes a file through write(binary file) into a temporary sibling, then renames it over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,207 @@
+import numpy as np
+import cirq
+from .ops import MimeticHadamard, MimeticCNOT, TopologicalStabilize
+
+def _quarter_turns(gate):
+    """Exponent of a pow gate in quarter turns (0-3), or None if it is not a Clifford power."""
+    if cirq.is_parameterized(gate):
+        return None
+    turns = 2 * float(gate.exponent)
+    if not np.isclose(turns, round(turns)):
+        return None
+    return int(round(turns)) % 4
+
+def _pow_decomposition(gate, primitive):
+    """Primitive ops for gates whose exponent must be an odd integer to be Clifford (H, CX, CZ, SWAP)."""
+    k = _quarter_turns(gate)
+    if k is None or k % 2:
+        return None
+    return primitive if k == 2 else []
+
+def _z_decomposition(gate):
+    k = _quarter_turns(gate)
+    return None if k is None else [("s", (0,))] * k
+
+def _x_decomposition(gate):
+    # X^t = H Z^t H
+    k = _quarter_turns(gate)
+    return None if k is None else [("h", (0,))] + [("s", (0,))] * k + [("h", (0,))]
+
+def _y_decomposition(gate):
+    # Y^t = S X^t S^dagger, applied right to left
+    k = _quarter_turns(gate)
+    return None if k is None else [("s", (0,))] * 3 + _x_decomposition(gate) + [("s", (0,))]
+
+# Gate type -> decomposition(gate) into primitive ('h' | 's' | 'cnot', local qubit indices)
+# tableau updates, or None if that instance is not Clifford. Global phases are dropped.
+CLIFFORD_DECOMPOSITIONS = {
+    cirq.ZPowGate: _z_decomposition,
+    cirq.XPowGate: _x_decomposition,
+    cirq.YPowGate: _y_decomposition,
+    cirq.HPowGate: lambda gate: _pow_decomposition(gate, [("h", (0,))]),
+    cirq.CXPowGate: lambda gate: _pow_decomposition(gate, [("cnot", (0, 1))]),
+    cirq.CZPowGate: lambda gate: _pow_decomposition(gate, [("h", (1,)), ("cnot", (0, 1)), ("h", (1,))]),
+    cirq.SwapPowGate: lambda gate: _pow_decomposition(gate, [("cnot", (0, 1)), ("cnot", (1, 0)), ("cnot", (0, 1))]),
+    cirq.IdentityGate: lambda gate: [],
+    MimeticHadamard: lambda gate: [("h", (0,))],
+    MimeticCNOT: lambda gate: [("cnot", (0, 1))],
+    TopologicalStabilize: lambda gate: [], # Identity unitary: only shapes the SPHY envelope
+}
+
+def clifford_decomposition(op):
+    """Primitive tableau updates for a Clifford operation, or None if it is not Clifford."""
+    for cls in type(op.gate).__mro__:
+        if cls in CLIFFORD_DECOMPOSITIONS:
+            return CLIFFORD_DECOMPOSITIONS[cls](op.gate)
+    return None
+
+def is_clifford_circuit(circuit):
+    """True if every operation is a measurement or has a Clifford decomposition."""
+    return all(
+        cirq.is_measurement(op) or clifford_decomposition(op) is not None
+        for op in circuit.all_operations()
+    )
+
+def _g(x1, z1, x2, z2):
+    """Exponent of i picked up when multiplying Pauli (x1, z1) into (x2, z2), per qubit (Aaronson-Gottesman)."""
+    x1, z1, x2, z2 = (np.asarray(a, dtype=np.int64) for a in (x1, z1, x2, z2))
+    return np.where(x1 & z1, z2 - x2, np.where(x1, z2 * (2 * x2 - 1), np.where(z1, x2 * (1 - 2 * z2), 0)))
+
+class StabilizerTableau:
+    """
+    Aaronson-Gottesman (CHP) stabilizer tableau for an n-qubit Clifford state.
+
+    Rows 0..n-1 are destabilizers and rows n..2n-1 stabilizers. The tableau
+    is bit-packed by column: x[k] and z[k] hold the X and Z bits of qubit k
+    for all 2n rows in ceil(2n/8) bytes, and r the row signs, so a gate on
+    qubit k is a handful of byte-wise operations on its columns. Memory is
+    O(n^2) bits instead of the 2^n amplitudes of a state vector.
+    """
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        rows = np.arange(2 * num_qubits)
+        x = np.zeros((2 * num_qubits, num_qubits), dtype=np.uint8)
+        z = np.zeros((2 * num_qubits, num_qubits), dtype=np.uint8)
+        x[rows[:num_qubits], np.arange(num_qubits)] = 1 # Destabilizers X_k
+        z[rows[num_qubits:], np.arange(num_qubits)] = 1 # Stabilizers Z_k: |0...0>
+        self._pack(x, z, np.zeros(2 * num_qubits, dtype=np.uint8))
+
+    @property
+    def nbytes(self):
+        return self.x.nbytes + self.z.nbytes + self.r.nbytes
+
+    def copy(self):
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = self.num_qubits
+        tableau.x, tableau.z, tableau.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return tableau
+
+    def _pack(self, x, z, r):
+        self.x = np.packbits(x.T, axis=1, bitorder="little")
+        self.z = np.packbits(z.T, axis=1, bitorder="little")
+        self.r = np.packbits(r, bitorder="little")
+
+    def _unpack(self):
+        """Returns (x, z, r) as (2n x n) and (2n,) uint8 bit arrays."""
+        count = 2 * self.num_qubits
+        x = np.unpackbits(self.x, axis=1, count=count, bitorder="little").T
+        z = np.unpackbits(self.z, axis=1, count=count, bitorder="little").T
+        r = np.unpackbits(self.r, count=count, bitorder="little")
+        return x, z, r
+
+    # --- Primitive Clifford updates on packed columns ---
+    def apply_h(self, a):
+        self.r ^= self.x[a] & self.z[a]
+        self.x[a], self.z[a] = self.z[a].copy(), self.x[a].copy()
+
+    def apply_s(self, a):
+        self.r ^= self.x[a] & self.z[a]
+        self.z[a] ^= self.x[a]
+
+    def apply_cnot(self, a, b):
+        self.r ^= self.x[a] & self.z[b] & ~(self.x[b] ^ self.z[a])
+        self.x[b] ^= self.x[a]
+        self.z[a] ^= self.z[b]
+
+    def apply_operation(self, op, axes):
+        """Applies a Clifford operation on the given qubit indices; raises ValueError otherwise."""
+        decomposition = clifford_decomposition(op)
+        if decomposition is None:
+            raise ValueError(f"Operation {op} is not a Clifford operation")
+        for name, local in decomposition:
+            getattr(self, f"apply_{name}")(*(axes[i] for i in local))
+
+    def _deterministic_outcomes(self, x, z, r, qubits):
+        """
+        Outcomes of measuring qubits that every stabilizer commutes with Z on.
+        Z_a is then +-(product of the stabilizers whose destabilizer has X on a);
+        the products for all qubits are accumulated at once, one stabilizer at a time.
+        """
+        n = self.num_qubits
+        scratch_x = np.zeros((len(qubits), n), dtype=np.uint8)
+        scratch_z = np.zeros((len(qubits), n), dtype=np.uint8)
+        phase = np.zeros(len(qubits), dtype=np.int64) # Exponent of i, mod 4
+        for i in range(n):
+            rows = x[i, qubits].astype(bool)
+            if not rows.any():
+                continue
+            sx, sz = x[n + i], z[n + i]
+            phase[rows] += 2 * int(r[n + i]) + _g(sx, sz, scratch_x[rows], scratch_z[rows]).sum(axis=1)
+            scratch_x[rows] ^= sx
+            scratch_z[rows] ^= sz
+        return (phase % 4 == 2).astype(np.uint8)
+
+    def get_marginals(self, qubits=None):
+        """
+        P(q_k = 1) for the given qubit indices (default: all), read from the
+        tableau: 0.5 if some stabilizer anticommutes with Z_k (a random
+        outcome), otherwise the deterministic outcome.
+        """
+        qubits = np.arange(self.num_qubits) if qubits is None else np.asarray(qubits, dtype=np.intp)
+        x, z, r = self._unpack()
+        random = x[self.num_qubits:, qubits].any(axis=0)
+        marginals = np.full(len(qubits), 0.5)
+        if not random.all():
+            marginals[~random] = self._deterministic_outcomes(x, z, r, qubits[~random])
+        return marginals
+
+    def measure(self, a, rng):
+        """Measures qubit a in the computational basis, collapsing the tableau. Returns the outcome bit."""
+        n = self.num_qubits
+        x, z, r = self._unpack()
+        anticommuting = np.flatnonzero(x[n:, a]) + n
+        if anticommuting.size == 0:
+            return int(self._deterministic_outcomes(x, z, r, np.array([a]))[0])
+
+        p = anticommuting[0]
+        rows = np.flatnonzero(x[:, a])
+        rows = rows[rows != p]
+        # rowsum(h, p) for every other row with X on a, vectorized over those rows
+        phase = 2 * r[rows].astype(np.int64) + 2 * int(r[p]) + _g(x[p], z[p], x[rows], z[rows]).sum(axis=1)
+        r[rows] = (phase % 4 == 2)
+        x[rows] ^= x[p]
+        z[rows] ^= z[p]
+
+        outcome = int(rng.random() < 0.5)
+        x[p - n], z[p - n], r[p - n] = x[p], z[p], r[p]
+        x[p], z[p] = 0, 0
+        z[p, a] = 1
+        r[p] = outcome
+        self._pack(x, z, r)
+        return outcome
+
+    def apply_moment(self, moment, qubit_index, rng):
+        """
+        Applies every operation of a moment; measurements collapse the tableau.
+        Returns True if the moment was unitary.
+        """
+        unitary = True
+        for op in moment:
+            axes = [qubit_index[q] for q in op.qubits]
+            if cirq.is_measurement(op):
+                for a in axes:
+                    self.measure(a, rng)
+                unitary = False
+            else:
+                self.apply_operation(op, axes)
+        return unitary
@@ -1,3 +1,4 @@
+import pytest
 import cirq
 import numpy as np
 from q_os.sphy_generator import get_sphy_wave_from_quantum_state
@@ -56,3 +57,42 @@ def test_large_qubit_sphy():
     
     wave_super = get_sphy_wave_from_quantum_state(state, num_qubits=n_qubits)
     assert wave_super.shape == (256,)
+
+def test_qudit_hyperposition_from_circuit_state():
+    """A d=14 qudit circuit state drives the C-O sphere wave directly."""
+    from q_os.sphy_generator import get_qudit_hyperposition_wave, get_14_qudit_hyperposition_waves
+
+    class QuditShift(cirq.Gate):
+        def _qid_shape_(self):
+            return (14,)
+        def _unitary_(self):
+            return np.roll(np.eye(14), 3, axis=0)
+
+    q0 = cirq.LineQid(0, dimension=14)
+    state = cirq.Simulator().simulate(cirq.Circuit(QuditShift().on(q0))).final_state_vector
+
+    wave = get_qudit_hyperposition_wave(state)
+    assert wave.shape == (256,)
+    assert wave.min() == 0 and wave.max() == 4095
+
+    # The fixed demo table is the special case a_n = 1/sqrt(n)
+    demo = get_qudit_hyperposition_wave(1.0 / np.sqrt(np.arange(1, 15)))
+    np.testing.assert_array_equal(demo, get_14_qudit_hyperposition_waves())
+
+def test_mixed_dimension_qudits():
+    """Several qudits with mixed dimensions are laced into consecutive harmonic bands."""
+    from q_os.sphy_generator import get_qudit_hyperposition_wave, get_qudit_marginals
+
+    qid_shape = (3, 14)
+    state = np.zeros(3 * 14, dtype=np.complex64)
+    state[1 * 14 + 5] = 1.0 # |1>|5>
+
+    marginals = get_qudit_marginals(state, qid_shape)
+    assert np.argmax(marginals[0]) == 1
+    assert np.argmax(marginals[1]) == 5
+
+    wave = get_qudit_hyperposition_wave(state, qid_shape=qid_shape)
+    assert wave.shape == (256,)
+
+    with pytest.raises(ValueError):
+        get_qudit_hyperposition_wave(state, qid_shape=(3, 13))
@@ -1,3 +1,6 @@
+import json
+import pytest
+from unittest.mock import patch
 import cirq
 import qurq
 import numpy as np
@@ -29,6 +32,70 @@ def test_mimetic_circuit():
     assert schedule[0]['modulation']['wave_type'] == "SPYSPI"
     assert schedule[1]['modulation']['wave_type'] == "HPHYSPI"
 
+def test_sphy_schedule_array():
+    """The schedule is a structured array covering every gate, extended by append."""
+    from qurq.circuit import SPHY_WAVE_TYPES
+    q = cirq.LineQubit.range(3)
+    circuit = qurq.Circuit([qurq.H(q[0]), cirq.X(q[1]), qurq.Stabilize(alpha=0.01)(q[2])])
+    schedule = circuit.sphy_schedule
+    assert len(schedule) == 3
+    assert not schedule.flags.writeable
+    assert list(schedule["moment"]) == [0, 0, 0]
+    assert np.allclose(schedule["phase"], [np.pi / 2, np.pi, 0])
+    assert schedule["envelope"][2] == 0.01
+    assert [SPHY_WAVE_TYPES[t] for t in schedule["wave_type"]] == ["SPYSPI", "SPYSPI", "HPHYSPI"]
+
+    circuit.append(cirq.CNOT(q[0], q[1]))
+    circuit.add(cirq.rz(0.5)(q[2]))
+    schedule = circuit.sphy_schedule
+    assert len(schedule) == 5
+    assert list(schedule[3]["qubits"]) == [0, 1, -1] and schedule[3]["coupling"] == 1
+    assert list(schedule["moment"][3:]) == [1, 1]
+    assert circuit.sphy_schedule_qubits == q
+
+    # Other mutations are picked up by a rebuild
+    circuit.insert(0, cirq.Y(q[0]))
+    assert len(circuit.sphy_schedule) == 6
+    assert circuit.sphy_schedule["moment"][0] == 0
+
+    # The list form keeps every key each gate reported, unrounded
+    stabilize = qurq.Stabilize(alpha=0.1)
+    circuit.append(stabilize(q[1]))
+    assert circuit.to_sphy_schedule()[-1] == {"qubits": [str(q[1])], "modulation": stabilize.sphy_modulation()}
+
+def test_sphy_schedule_built_on_read():
+    """Appends leave the schedule alone; it is brought up to date once, when read."""
+    import qurq.circuit
+    q = cirq.LineQubit.range(2)
+    circuit = qurq.Circuit()
+    with patch("qurq.circuit._modulation", wraps=qurq.circuit._modulation) as modulation:
+        for i in range(500):
+            circuit.append(qurq.H(q[i % 2]))
+        assert modulation.call_count == 0
+        assert len(circuit.sphy_schedule) == 500
+        assert modulation.call_count == 500
+
+def test_sphy_timeline():
+    """The timeline renders one wave per moment and re-renders only new operations."""
+    from q_os.sphy_generator import get_regularized_sphy_waves, get_entangled_sphy_waves, COMPACT_WAVE_SPEC
+    q = cirq.LineQubit.range(2)
+    circuit = qurq.Circuit([cirq.I(q[0]), qurq.Stabilize(alpha=0.02)(q[1])])
+    circuit.append(cirq.CNOT(*q))
+
+    timeline = circuit.render_sphy_timeline()
+    assert timeline.shape == (2, 256) and timeline.dtype == COMPACT_WAVE_SPEC.dtype
+    assert circuit.render_sphy_timeline() is timeline
+    regularized = get_regularized_sphy_waves(spec=COMPACT_WAVE_SPEC).astype(float)
+    stabilized = get_regularized_sphy_waves(alpha=0.02, spec=COMPACT_WAVE_SPEC).astype(float)
+    np.testing.assert_array_equal(timeline[0], ((regularized + stabilized) / 2).astype(np.uint16))
+    np.testing.assert_array_equal(timeline[1], get_entangled_sphy_waves(spec=COMPACT_WAVE_SPEC))
+
+    circuit.append(cirq.H(q[0]))
+    extended = circuit.render_sphy_timeline()
+    assert extended.shape == (3, 256)
+    np.testing.assert_array_equal(extended[:2], timeline)
+    np.testing.assert_array_equal(extended[2], (regularized * np.cos(np.pi / 4)).astype(np.uint16))
+
 def test_mimetic_simulation():
     """Test the MimeticSimulator."""
     q = cirq.NamedQubit("q")
@@ -64,3 +131,586 @@ def test_mimetic_simulation():
     assert step_result is False
     info = sim.get_current_debug_info()
     assert info['status'] == "Finished"
+
+def test_incremental_lacing_matches_full_recompute():
+    """Per-moment lacing updates track a full recompute from the state vector."""
+    from q_os.sphy_generator import get_sphy_wave_from_quantum_state, get_qubit_marginals, COMPACT_WAVE_SPEC
+
+    qubits = cirq.LineQubit.range(8)
+    circuit = cirq.testing.random_circuit(qubits, n_moments=12, op_density=0.4, random_state=11)
+    circuit.append(cirq.measure(qubits[0]))
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    while sim.step():
+        expected = get_sphy_wave_from_quantum_state(sim._state_vector, 8, spec=COMPACT_WAVE_SPEC)
+        assert np.abs(sim._sphy_waves.astype(int) - expected).max() <= 1
+        np.testing.assert_allclose(sim._marginals, get_qubit_marginals(sim._state_vector), atol=1e-6)
+
+def test_single_precision_pipeline():
+    """Single-precision mode keeps the whole wave pipeline in float32 and agrees with double precision."""
+    from q_os.sphy_generator import SINGLE_PRECISION_WAVE_SPEC
+
+    qubits = cirq.LineQubit.range(6)
+    circuit = cirq.Circuit(qurq.H.on_each(*qubits), cirq.CNOT(qubits[0], qubits[5]), cirq.X(qubits[2]))
+
+    sim_single = qurq.MimeticSimulator(spec=SINGLE_PRECISION_WAVE_SPEC)
+    sim_double = qurq.MimeticSimulator()
+    for sim in (sim_single, sim_double):
+        sim.load_circuit(circuit)
+        while sim.step():
+            pass
+
+    assert sim_single._lacing_sum.dtype == np.float32
+    assert sim_single._marginals.dtype == np.float32
+    assert sim_single._sphy_waves.dtype == np.uint16
+    assert np.abs(sim_single._sphy_waves.astype(int) - sim_double._sphy_waves).max() <= 2
+
+def test_native_kernel_matches_cirq():
+    """Native moment application matches Cirq's simulator in the same qubit order."""
+    qubits = cirq.LineQubit.range(6)
+    circuit = cirq.testing.random_circuit(qubits, n_moments=15, op_density=0.8, random_state=5)
+    circuit.append(qurq.H(qubits[3]))
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    while sim.step():
+        pass
+
+    expected = cirq.Simulator().simulate(circuit, qubit_order=sorted(circuit.all_qubits())).final_state_vector
+    assert sim._state_vector.dtype == np.complex64
+    assert np.allclose(sim._state_vector, expected, atol=1e-5)
+
+def test_run_matches_stepping():
+    """Fused run-to-completion reaches the same state and wave as stepping."""
+    qubits = cirq.LineQubit.range(7)
+    circuit = cirq.testing.random_circuit(qubits, n_moments=20, op_density=0.7, random_state=3)
+
+    stepped = qurq.MimeticSimulator()
+    stepped.load_circuit(circuit)
+    while stepped.step():
+        pass
+
+    fused = qurq.MimeticSimulator()
+    fused.load_circuit(circuit)
+    fused.step()
+    assert fused.run() == len(circuit) - 1
+    assert fused.run() == 0
+    assert fused.get_current_debug_info()['status'] == "Finished"
+
+    assert np.allclose(fused._state_vector, stepped._state_vector, atol=1e-5)
+    assert np.abs(fused._sphy_waves.astype(int) - stepped._sphy_waves).max() <= 1
+
+def test_fused_blocks_and_measurement():
+    """Fusion keeps blocks within two qubits and run() handles non-unitary moments."""
+    from qurq.kernels import fuse_operations
+
+    qubits = cirq.LineQubit.range(5)
+    circuit = cirq.testing.random_circuit(qubits, n_moments=12, op_density=0.9, random_state=8)
+    ops = list(circuit.all_operations())
+    blocks = fuse_operations(ops, {q: i for i, q in enumerate(qubits)})
+    assert len(blocks) < len(ops)
+    assert all(len(axes) <= 2 for axes, _ in blocks)
+
+    circuit = cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(qubits[0], qubits[1]), cirq.measure(qubits[0]), cirq.X(qubits[2])])
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    sim.run()
+    probabilities = sim.get_current_debug_info()['qubit_probabilities']
+    # The measurement collapses q0 and its entangled partner q1 together
+    assert probabilities[str(qubits[0])] == probabilities[str(qubits[1])]
+    assert probabilities[str(qubits[2])]['1'] == 1.0
+
+def test_step_back_and_jump_to():
+    """Checkpointed jumps reproduce the states reached by stepping."""
+    qubits = cirq.LineQubit.range(5)
+    circuit = cirq.testing.random_circuit(qubits, n_moments=40, op_density=0.6, random_state=21)
+
+    sim = qurq.MimeticSimulator(checkpoint_interval=8)
+    sim.load_circuit(circuit)
+    history = [sim._state_vector.copy()]
+    while sim.step():
+        history.append(sim._state_vector.copy())
+    assert sorted(sim._checkpoints) == [8, 16, 24, 32, 40]
+
+    assert sim.step_back() is True
+    assert sim._current_step == len(circuit) - 1
+    assert np.allclose(sim._state_vector, history[-2], atol=1e-5)
+
+    for k in (3, 37, 0, 16, 25):
+        assert sim.jump_to(k) is True
+        assert sim._current_step == k
+        assert np.allclose(sim._state_vector, history[k], atol=1e-5)
+    assert sim.get_current_debug_info()['current_step'] == 25
+
+    sim.jump_to(0)
+    assert sim.step_back() is False
+    with pytest.raises(ValueError):
+        sim.jump_to(len(circuit) + 1)
+
+def test_checkpoint_memory_budget():
+    """Checkpoints stay within the memory budget, evicting the oldest first."""
+    qubits = cirq.LineQubit.range(4)
+    circuit = cirq.Circuit([cirq.X(q) for q in qubits] * 10)
+
+    state_bytes = 2**4 * np.dtype(np.complex64).itemsize
+    sim = qurq.MimeticSimulator(checkpoint_interval=2, checkpoint_memory=3 * state_bytes)
+    sim.load_circuit(circuit)
+    sim.jump_to(len(circuit))
+    assert list(sim._checkpoints) == [len(circuit) - 4, len(circuit) - 2, len(circuit)]
+
+def test_memmap_backend_matches_in_memory():
+    """Chunked memory-mapped simulation matches the in-memory kernel."""
+    qubits = cirq.LineQubit.range(9)
+    circuit = cirq.testing.random_circuit(qubits[:8], n_moments=16, op_density=0.8, random_state=13)
+    # A deterministic measurement, so both simulators collapse the same way
+    circuit.append([cirq.X(qubits[8]), cirq.measure(qubits[8])])
+
+    in_memory = qurq.MimeticSimulator()
+    in_memory.load_circuit(circuit)
+    while in_memory.step():
+        pass
+
+    # Chunks of 2**5 amplitudes: the first four qubits select the chunk
+    mapped = qurq.MimeticSimulator(state_memory=0, chunk_size=2**5)
+    mapped.load_circuit(circuit)
+    assert isinstance(mapped._state_vector, np.memmap)
+    mapped.step()
+    mapped.run()
+
+    assert np.allclose(mapped._state_vector, in_memory._state_vector, atol=1e-5)
+    assert np.allclose(mapped._marginals, in_memory._marginals, atol=1e-5)
+    assert np.abs(mapped._sphy_waves.astype(int) - in_memory._sphy_waves).max() <= 1
+
+    assert mapped.jump_to(5) and in_memory.jump_to(5)
+    assert np.allclose(mapped._state_vector, in_memory._state_vector, atol=1e-5)
+
+def test_memmap_backend_beyond_14_qubits():
+    """Circuits wider than the in-memory budget are simulated instead of rejected."""
+    qubits = cirq.LineQubit.range(20)
+    # The T gate keeps the circuit off the Clifford tableau fast path
+    circuit = cirq.Circuit([cirq.H(qubits[0])] + [cirq.CNOT(qubits[0], q) for q in qubits[1:]] + [cirq.T(qubits[0])])
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    assert isinstance(sim._state_vector, np.memmap)
+    sim.run()
+    assert np.allclose(sim._marginals, 0.5, atol=1e-5)
+    assert np.isclose(abs(sim._state_vector[-1])**2, 0.5, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        sim.load_circuit(cirq.Circuit(cirq.T.on_each(cirq.LineQubit.range(29))))
+
+def test_sharded_backend_matches_single_process():
+    """Sharding the state across worker processes reproduces the single-process simulation."""
+    qubits = cirq.LineQubit.range(9)
+    circuit = cirq.testing.random_circuit(qubits[:8], n_moments=16, op_density=0.8, random_state=17)
+    circuit.append([cirq.CNOT(qubits[0], qubits[7]), cirq.X(qubits[8]), cirq.measure(qubits[8])])
+
+    single = qurq.MimeticSimulator()
+    single.load_circuit(circuit)
+    single.step()
+    single.run()
+
+    sharded = qurq.MimeticSimulator(workers=4)
+    try:
+        sharded.load_circuit(circuit)
+        sharded.step()
+        sharded.run()
+        # Same kernel on the same amplitudes: bit-identical states
+        assert np.array_equal(sharded._state_vector, single._state_vector)
+        assert np.allclose(sharded._marginals, single._marginals, atol=1e-6)
+        assert np.array_equal(sharded._sphy_waves, single._sphy_waves)
+
+        assert sharded.jump_to(3) and single.jump_to(3)
+        assert np.allclose(sharded._state_vector, single._state_vector, atol=1e-6)
+
+        # Reloading, even at another width, keeps the worker pool
+        pool = sharded._sharded._pool
+        narrower = cirq.Circuit(cirq.H(qubits[0]), cirq.CNOT(qubits[0], qubits[5]))
+        sharded.load_circuit(narrower)
+        single.load_circuit(narrower)
+        sharded.run()
+        single.run()
+        assert sharded._sharded._pool is pool
+        assert np.array_equal(sharded._state_vector, single._state_vector)
+        sharded.reset()
+        assert sharded._sharded._pool is pool and sharded._state_vector[0] == 1
+    finally:
+        sharded.close()
+
+    with pytest.raises(ValueError):
+        qurq.MimeticSimulator(workers=3).load_circuit(circuit)
+
+def test_sample_shots():
+    """Vectorized sampling follows the state's distribution and packs the bits."""
+    qubits = cirq.LineQubit.range(3)
+    circuit = cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(qubits[0], qubits[1]), cirq.X(qubits[2])])
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    sim.run()
+    result = sim.sample(20000, seed=1)
+
+    assert result['qubits'] == [str(q) for q in qubits]
+    assert result['packed_bits'].shape == (20000, 1)
+    bits = np.unpackbits(result['packed_bits'], axis=1, count=3)
+    # GHZ-like pair on q0, q1; q2 always 1
+    assert np.array_equal(bits[:, 0], bits[:, 1])
+    assert bits[:, 2].all()
+    assert list(result['outcomes']) == [0b001, 0b111]
+    assert result['counts'].sum() == 20000
+    assert abs(result['counts'][0] / 20000 - 0.5) < 0.02
+
+    # Sampling a subset in a chosen order sums out the rest
+    subset = sim.sample(1000, qubits=[qubits[2], qubits[0]], seed=2)
+    assert set(subset['outcomes']) <= {0b10, 0b11}
+    assert np.array_equal(sim.sample(100, seed=3)['packed_bits'], sim.sample(100, seed=3)['packed_bits'])
+
+    mapped = qurq.MimeticSimulator(state_memory=0, chunk_size=2)
+    mapped.load_circuit(circuit)
+    mapped.run()
+    assert np.array_equal(mapped.sample(500, seed=4)['packed_bits'], sim.sample(500, seed=4)['packed_bits'])
+
+    # Shots wider than a byte pack into np.packbits rows that match the histogram
+    wide = qurq.MimeticSimulator()
+    wide.load_circuit(cirq.Circuit(cirq.H.on_each(*cirq.LineQubit.range(11))))
+    wide.run()
+    result = wide.sample(3000, seed=5)
+    assert result['packed_bits'].shape == (3000, 2)
+    bits = np.unpackbits(result['packed_bits'], axis=1, count=11)
+    shots = bits.astype(np.int64) @ (1 << np.arange(10, -1, -1))
+    outcomes, counts = np.unique(shots, return_counts=True)
+    assert np.array_equal(outcomes, result['outcomes']) and np.array_equal(counts, result['counts'])
+    assert not np.unpackbits(result['packed_bits'], axis=1)[:, 11:].any()
+
+    with pytest.raises(ValueError):
+        qurq.MimeticSimulator().sample(10)
+
+def test_clifford_circuits_run_on_tableau():
+    """Wide Clifford circuits run on the stabilizer tableau, with marginals read from it."""
+    from qurq.stabilizer import StabilizerTableau
+
+    qubits = cirq.LineQubit.range(8)
+    circuit = cirq.Circuit([
+        qurq.H(qubits[0]), cirq.S(qubits[0]), cirq.S(qubits[0]), cirq.H(qubits[0]), # |1>
+        cirq.H(qubits[1]), qurq.CNOT(qubits[1], qubits[2]), qurq.Stabilize()(qubits[3]),
+        cirq.CZ(qubits[4], qubits[5]), cirq.X(qubits[6]), cirq.SWAP(qubits[6], qubits[7]),
+    ])
+
+    reference = qurq.MimeticSimulator()
+    reference.load_circuit(circuit)
+    reference.run()
+
+    # An 8-qubit state vector exceeds this budget, so the tableau takes over
+    sim = qurq.MimeticSimulator(state_memory=0)
+    sim.load_circuit(circuit)
+    assert isinstance(sim._tableau, StabilizerTableau) and sim._state_vector is None
+    sim.step()
+    sim.run()
+    assert np.allclose(sim._marginals, reference._marginals, atol=1e-6)
+    assert np.abs(sim._sphy_waves.astype(int) - reference._sphy_waves).max() <= 1
+
+    assert sim.jump_to(2)
+    assert sim.get_current_debug_info()['qubit_probabilities'][str(qubits[0])]['1'] == 0.5
+    with pytest.raises(ValueError):
+        sim.sample(10)
+
+    # A T gate is not Clifford: back to the memory-mapped state vector
+    sim.load_circuit(circuit + cirq.Circuit(cirq.T(qubits[0])))
+    assert sim._tableau is None and isinstance(sim._state_vector, np.memmap)
+
+def test_tableau_handles_hundreds_of_qubits():
+    """A 300-qubit GHZ state with a measurement stays cheap on the tableau."""
+    qubits = cirq.LineQubit.range(300)
+    circuit = cirq.Circuit([cirq.H(qubits[0])] + [cirq.CNOT(qubits[0], q) for q in qubits[1:]])
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    sim.run()
+    assert np.allclose(sim._marginals, 0.5)
+
+    sim.load_circuit(circuit + cirq.Circuit(cirq.measure(qubits[0])))
+    sim.run()
+    # Measuring one qubit of a GHZ state fixes all of them to the same outcome
+    assert np.all(sim._marginals == sim._marginals[0]) and sim._marginals[0] in (0.0, 1.0)
+
+def test_simulate_sweep_matches_individual_runs():
+    """A batched sweep matches resolving and simulating each point on its own."""
+    import sympy
+    theta, phi = sympy.Symbol("theta"), sympy.Symbol("phi")
+    qubits = cirq.LineQubit.range(5)
+    circuit = cirq.Circuit([
+        cirq.H.on_each(*qubits),
+        cirq.rz(theta)(qubits[0]), cirq.CNOT(qubits[0], qubits[3]),
+        cirq.XPowGate(exponent=phi)(qubits[4]), cirq.ry(theta)(qubits[2]),
+        cirq.CZPowGate(exponent=phi)(qubits[1], qubits[2]),
+    ])
+    sweep = cirq.Linspace("theta", 0, np.pi, 6) * cirq.Points("phi", [0.25, 0.5])
+
+    sim = qurq.MimeticSimulator()
+    result = sim.simulate_sweep(circuit, sweep)
+    assert result['state_vectors'].shape == (12, 2**5)
+    assert result['marginals'].shape == (12, 5)
+    assert result['sphy_waves'].shape == (12, 256)
+    assert sim._circuit is None
+
+    for row, resolver in enumerate(cirq.to_resolvers(sweep)):
+        single = qurq.MimeticSimulator()
+        single.load_circuit(cirq.resolve_parameters(circuit, resolver))
+        single.run()
+        assert np.allclose(result['state_vectors'][row], single._state_vector, atol=1e-5)
+        assert np.allclose(result['marginals'][row], single._marginals, atol=1e-5)
+        assert np.abs(result['sphy_waves'][row].astype(int) - single._sphy_waves).max() <= 1
+
+    with pytest.raises(ValueError):
+        sim.simulate_sweep(circuit + cirq.Circuit(cirq.measure(qubits[0])), sweep)
+
+def test_noise_trajectories_match_density_matrix():
+    """Averaged trajectory marginals converge to the density-matrix marginals."""
+    qubits = cirq.LineQubit.range(3)
+    circuit = cirq.Circuit([
+        cirq.X(qubits[0]), cirq.amplitude_damp(0.3)(qubits[0]),
+        cirq.H(qubits[1]), cirq.phase_damp(0.4)(qubits[1]), cirq.H(qubits[1]),
+        cirq.CNOT(qubits[1], qubits[2]),
+    ])
+    noise = cirq.depolarize(0.05)
+
+    sim = qurq.MimeticSimulator()
+    result = sim.simulate_trajectories(circuit, 4000, noise=noise, seed=5)
+    assert result['state_vectors'].shape == (4000, 8)
+    assert np.allclose(np.linalg.norm(result['state_vectors'], axis=1), 1, atol=1e-5)
+    assert result['sphy_waves'].shape == (4000, 256)
+    assert result['mean_sphy_wave'].dtype == sim._spec.dtype
+
+    rho = cirq.DensityMatrixSimulator().simulate(circuit.with_noise(noise), qubit_order=qubits).final_density_matrix
+    expected = np.real(np.diag(rho)).reshape(2, 2, 2)
+    expected = [expected[1].sum(), expected[:, 1].sum(), expected[:, :, 1].sum()]
+    assert np.allclose(result['marginals'], expected, atol=0.03)
+
+def test_trajectory_measurements_collapse_each_copy():
+    """Measurements collapse every trajectory independently."""
+    qubits = cirq.LineQubit.range(2)
+    circuit = cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(qubits[0], qubits[1]), cirq.measure(qubits[0])])
+
+    result = qurq.MimeticSimulator().simulate_trajectories(circuit, 1000, seed=1)
+    probabilities = np.abs(result['state_vectors'])**2
+    # Each trajectory ends in |00> or |11>, roughly half each
+    collapsed_to_11 = np.isclose(probabilities[:, 3], 1, atol=1e-5)
+    assert np.all(collapsed_to_11 | np.isclose(probabilities[:, 0], 1, atol=1e-5))
+    assert 0.4 < collapsed_to_11.mean() < 0.6
+
+    # Measuring many qubits samples each trajectory's outcome rather than expanding every Kraus branch
+    qubits = cirq.LineQubit.range(12)
+    circuit = cirq.Circuit([cirq.H.on_each(*qubits), cirq.measure(*qubits)])
+    states = qurq.MimeticSimulator().simulate_trajectories(circuit, 64, seed=2)['state_vectors']
+    probabilities = np.abs(states)**2
+    assert np.allclose(probabilities.max(axis=1), 1, atol=1e-5)
+    assert len(np.unique(probabilities.argmax(axis=1))) > 32
+
+def test_snapshot_resumes_state_and_circuit(tmp_path):
+    """save_state/load_state resume the circuit, state vector and waves mid-run."""
+    qubits = cirq.LineQubit.range(3)
+    circuit = cirq.Circuit([
+        qurq.H(qubits[0]), cirq.CNOT(qubits[0], qubits[1]), cirq.T(qubits[1]),
+        qurq.Stabilize(0.01)(qubits[2]), cirq.rx(0.3)(qubits[2]), cirq.CZ(qubits[1], qubits[2]),
+    ])
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    sim.jump_to(3)
+    path = tmp_path / "session.json"
+    sim.save_state(str(path))
+    generation = json.loads(path.read_text())['state_generation']
+    assert {p.name for p in tmp_path.iterdir()} == {"session.json", f"session.{generation}.npy"}
+
+    restored = qurq.MimeticSimulator()
+    assert restored.load_state(str(path))
+    assert restored._current_step == 3
+    assert len(restored._circuit) == len(circuit)
+    np.testing.assert_array_equal(restored._state_vector, sim._state_vector)
+    np.testing.assert_array_equal(restored._sphy_waves, sim._sphy_waves)
+
+    sim.run()
+    restored.run()
+    np.testing.assert_allclose(restored._state_vector, sim._state_vector, atol=1e-6)
+    np.testing.assert_array_equal(restored._sphy_waves, sim._sphy_waves)
+    assert restored.step_back()
+
+    # A later save replaces the state file of the earlier generation, and only that one
+    (tmp_path / "session.backup.npy").write_bytes(b"unrelated")
+    sim.save_state(str(path))
+    generation = json.loads(path.read_text())["state_generation"]
+    assert {p.name for p in tmp_path.glob("session.*.npy")} == {f"session.{generation}.npy", "session.backup.npy"}
+
+def test_snapshot_survives_interrupted_save(tmp_path):
+    """A save interrupted before its JSON is in place leaves the previous snapshot consistent."""
+    qubits = cirq.LineQubit.range(2)
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(*qubits), cirq.X(qubits[0])]))
+    sim.jump_to(1)
+    path = tmp_path / "session.json"
+    sim.save_state(str(path))
+    saved = sim._state_vector.copy()
+
+    sim.step()
+    with patch("qurq.sim._write_atomically", side_effect=[None, OSError("disk full")]) as write:
+        with pytest.raises(OSError):
+            sim.save_state(str(path))
+    assert write.call_count == 2
+
+    restored = qurq.MimeticSimulator()
+    assert restored.load_state(str(path))
+    assert restored._current_step == 1
+    np.testing.assert_array_equal(restored._state_vector, saved)
+
+def test_snapshot_without_serializable_circuit(tmp_path):
+    """Sessions with custom gates cirq cannot serialize still save their legacy fields."""
+    class Custom(cirq.Gate):
+        def _num_qubits_(self):
+            return 1
+
+        def _unitary_(self):
+            return np.eye(2)
+
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(cirq.Circuit(Custom()(cirq.LineQubit(0))))
+    sim.step()
+    path = tmp_path / "session.json"
+    sim.save_state(str(path))
+    assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
+    assert "circuit" not in json.loads(path.read_text())
+
+    restored = qurq.MimeticSimulator()
+    assert restored.load_state(str(path))
+    assert restored._current_step == 1
+    np.testing.assert_array_equal(restored._sphy_waves, sim._sphy_waves)
+
+def test_snapshot_replays_tableau_sessions(tmp_path):
+    """Tableau-backed sessions store no state vector and are replayed on load."""
+    qubits = cirq.LineQubit.range(20)
+    circuit = cirq.Circuit([cirq.H(qubits[0])] + [cirq.CNOT(qubits[0], q) for q in qubits[1:]])
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    sim.jump_to(5)
+    path = tmp_path / "session.json"
+    sim.save_state(str(path))
+    assert not list(tmp_path.glob("*.npy"))
+
+    restored = qurq.MimeticSimulator()
+    assert restored.load_state(str(path))
+    assert restored._tableau is not None and restored._current_step == 5
+    np.testing.assert_array_equal(restored._tableau.get_marginals(), sim._tableau.get_marginals())
+
+def test_debug_info_cached_per_version():
+    """Debug info is rebuilt and re-encoded only when the version changes."""
+    qubits = cirq.LineQubit.range(2)
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(*qubits)]))
+
+    version, payload = sim.get_debug_info_json()
+    assert version == sim.version
+    assert sim.get_debug_info_json()[1] is payload
+    assert sim.get_current_debug_info() is sim.get_current_debug_info()
+    assert json.loads(payload)['current_step'] == 0
+
+    sim.step()
+    version, payload = sim.get_debug_info_json()
+    info = json.loads(payload)
+    assert info['current_step'] == 1
+    assert info['qubit_probabilities']['q(0)'] == {"0": 0.5, "1": 0.5}
+
+    for change in (sim.step, sim.step, sim.step_back, lambda: sim.jump_to(2), sim.run, sim.reset):
+        before = sim.version
+        change()
+        assert sim.version > before
+    assert json.loads(sim.get_debug_info_json()[1]) == sim._build_debug_info()
+
+    # The gate info is in place by the time the version is bumped, so a concurrent poll caches it
+    seen = []
+    bump = sim._bump_version
+    def record():
+        bump()
+        seen.append((sim.version, sim._current_gate_info))
+    with patch.object(sim, "_bump_version", record):
+        for change in (lambda: sim.load_circuit(sim._circuit), lambda: sim.jump_to(1), sim.run):
+            change()
+            assert seen[-1] == (sim.version, sim._current_gate_info)
+
+    # Operations appended to the loaded circuit show up once the plan is recompiled
+    circuit = cirq.Circuit([cirq.H(qubits[0]), cirq.I(qubits[1])])
+    sim.load_circuit(circuit)
+    sim.step()
+    circuit.append(cirq.CNOT(*qubits))
+    before = sim.version
+    assert sim.step()
+    assert sim.version > before
+    info = sim.get_current_debug_info()
+    assert info == sim._build_debug_info()
+    assert info['total_steps'] == 2 and info['status'] == "Finished"
+
+def test_compiled_circuit_cache():
+    """Equal circuits share one compiled plan; changed circuits are recompiled."""
+    from qurq.compiler import compile_circuit, FUSED_CACHE_SIZE
+
+    def build(alpha=0.01):
+        q = cirq.LineQubit.range(3)
+        return qurq.Circuit([
+            qurq.H(q[0]), cirq.CNOT(q[0], q[1]), qurq.Stabilize(alpha)(q[2]),
+            cirq.rz(0.2)(q[2]), cirq.measure(q[1]),
+        ])
+
+    plan = compile_circuit(build())
+    assert compile_circuit(build()) is plan
+    assert compile_circuit(build(alpha=0.02)) is not plan
+    assert plan.qubits == tuple(cirq.LineQubit.range(3))
+    assert plan.unitary_moments == (True, True, False)
+    assert plan.touched[1] == [0, 1, 2]
+    assert plan.fused_blocks(0, 2) is plan.fused_blocks(0, 2)
+
+    circuit = build()
+    circuit.append(cirq.X(cirq.LineQubit(0)))
+    mutated = compile_circuit(circuit)
+    assert mutated is not plan and mutated.touched[2] == [0, 1]
+
+    # Reloading reuses the plan and reproduces the same run
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(build()[:-1])
+    sim.run()
+    first = sim._state_vector.copy()
+    sim.load_circuit(build()[:-1])
+    assert sim._plan is compile_circuit(build()[:-1])
+    sim.run()
+    np.testing.assert_array_equal(sim._state_vector, first)
+
+    # Fused ranges are kept for the most recently used ones only
+    for stop in range(FUSED_CACHE_SIZE + 2):
+        plan.fused_blocks(0, stop % 3)
+        plan.fused_blocks(stop % 2, 2)
+    assert len(plan._fused) <= FUSED_CACHE_SIZE
+
+def test_appending_to_a_loaded_circuit():
+    """Operations appended after loading are simulated, whether in new or existing moments."""
+    q = cirq.LineQubit.range(3)
+    circuit = qurq.Circuit([qurq.H(q[0]), cirq.CNOT(q[0], q[1]), cirq.X(q[2])])
+    sim = qurq.MimeticSimulator()
+    sim.load_circuit(circuit)
+    assert sim.step()
+    assert sim.step()
+
+    circuit.append(cirq.rz(0.3)(q[1]))       # New moment
+    circuit.append(cirq.Z(q[2]), strategy=cirq.InsertStrategy.EARLIEST) # Merged into the second moment
+    circuit.append(qurq.H(q[2]))
+    assert sim.step()
+    assert sim.run() == len(circuit) - 3
+
+    expected = qurq.MimeticSimulator()
+    expected.load_circuit(circuit)
+    expected.run()
+    # The merged Z lands in an already applied moment and is not replayed; jumping back replays it
+    assert sim.jump_to(0) and sim.jump_to(len(circuit))
+    np.testing.assert_allclose(sim._state_vector, expected._state_vector, atol=1e-6)
+    assert not sim.step()
+
+    circuit.append(qurq.H(cirq.LineQubit(3)))
+    with pytest.raises(ValueError):
+        sim.step()
@@ -1,6 +1,7 @@
-from q_os.sphy_generator import generate_sphy_waves, get_regularized_sphy_waves, get_14_qudit_hyperposition_waves
+from q_os.sphy_generator import generate_sphy_waves, get_regularized_sphy_waves, get_14_qudit_hyperposition_waves, get_entangled_sphy_waves, get_sphy_wave_from_quantum_state, WaveSpec, COMPACT_WAVE_SPEC
 import numpy as np
 import os
+import pytest
 
 def test_all_wave_modes():
     """Test all wave generation modes to ensure coverage."""
@@ -31,3 +32,88 @@ def test_wave_properties():
     assert len(qudit_wave) == 256
     assert np.max(qudit_wave) <= 4095
     assert np.min(qudit_wave) >= 0
+
+def test_reference_tables_are_cached_and_read_only():
+    """Reference tables are memoized per parameter set and cannot be mutated by callers."""
+    reg_wave = get_regularized_sphy_waves()
+    assert get_regularized_sphy_waves() is reg_wave
+    assert not reg_wave.flags.writeable
+    with pytest.raises(ValueError):
+        reg_wave[0] = 0
+
+    # Different parameters produce a different cached table
+    hi_res = get_regularized_sphy_waves(spec=WaveSpec(points=1024))
+    assert len(hi_res) == 1024
+    assert get_entangled_sphy_waves(0.5) is not get_entangled_sphy_waves(1.0)
+    assert get_entangled_sphy_waves(0.5) is get_entangled_sphy_waves(0.5)
+
+def test_wave_spec_output_format():
+    """WaveSpec controls resolution, bit depth and dtype of every generator."""
+    compact = get_regularized_sphy_waves(spec=COMPACT_WAVE_SPEC)
+    assert compact.dtype == np.uint16
+    assert compact.nbytes * 4 == get_regularized_sphy_waves().nbytes
+    np.testing.assert_array_equal(compact, get_regularized_sphy_waves())
+
+    spec = WaveSpec(points=4096, bit_depth=16, dtype=np.uint16)
+    for wave in (get_regularized_sphy_waves(spec=spec), get_14_qudit_hyperposition_waves(spec=spec)):
+        assert wave.shape == (4096,)
+        assert wave.max() == 65535
+        assert wave.min() == 0
+
+    state = np.array([1, 0, 0, 1], dtype=np.complex64) / np.sqrt(2)
+    wave = get_sphy_wave_from_quantum_state(state, spec=WaveSpec(points=1024, dtype=np.uint16))
+    assert wave.shape == (1024,)
+    assert wave.dtype == np.uint16
+
+def test_wave_spec_rejects_narrow_dtype():
+    """A dtype that cannot hold the requested bit depth is rejected."""
+    with pytest.raises(ValueError):
+        WaveSpec(bit_depth=12, dtype=np.uint8)
+
+def test_batched_state_waves_match_single():
+    """The batched converter matches per-state conversion row by row."""
+    from q_os.sphy_generator import get_sphy_waves_from_quantum_states
+
+    rng = np.random.default_rng(3)
+    for n_qubits in (2, 6):
+        states = rng.normal(size=(8, 2**n_qubits)) + 1j * rng.normal(size=(8, 2**n_qubits))
+        states /= np.linalg.norm(states, axis=1, keepdims=True)
+
+        waves = get_sphy_waves_from_quantum_states(states, spec=COMPACT_WAVE_SPEC)
+        assert waves.shape == (8, 256)
+        assert waves.dtype == np.uint16
+        for state, wave in zip(states, waves):
+            np.testing.assert_array_equal(wave, get_sphy_wave_from_quantum_state(state, spec=COMPACT_WAVE_SPEC))
+
+    with pytest.raises(ValueError):
+        get_sphy_waves_from_quantum_states(np.ones(4))
+
+def test_fft_synthesis_matches_direct_sum():
+    """FFT synthesis folds harmonics above Nyquist exactly like the direct sum on the sample grid."""
+    from q_os.sphy_generator import synthesize_harmonics_fft
+
+    rng = np.random.default_rng(5)
+    x = np.linspace(0, 2 * np.pi, 256)
+    for num_harmonics in (10, 600):
+        sin_coeffs = rng.normal(size=num_harmonics)
+        cos_coeffs = rng.normal(size=num_harmonics)
+        harmonics = np.arange(1, num_harmonics + 1)[:, None] * x
+        direct = sin_coeffs @ np.sin(harmonics) + cos_coeffs @ np.cos(harmonics)
+        np.testing.assert_allclose(synthesize_harmonics_fft(sin_coeffs, cos_coeffs, 256), direct, atol=1e-8)
+
+    # Truncation drops everything above Nyquist (127 for 256 points)
+    sin_coeffs = np.zeros(200)
+    sin_coeffs[150] = 1.0
+    np.testing.assert_allclose(synthesize_harmonics_fft(sin_coeffs, np.zeros(200), 256, fold=False), 0, atol=1e-12)
+
+def test_configurable_lacing_threshold():
+    """Raising the lacing threshold renders wide states in full hyperposition via FFT."""
+    n_qubits = 10
+    state = np.zeros(2**n_qubits, dtype=np.complex64)
+    state[[0, 5, 700]] = 1 / np.sqrt(3)
+
+    hyper = get_sphy_wave_from_quantum_state(state, spec=COMPACT_WAVE_SPEC, lacing_threshold=14)
+    laced = get_sphy_wave_from_quantum_state(state, spec=COMPACT_WAVE_SPEC)
+    assert hyper.shape == laced.shape == (256,)
+    assert hyper.max() == 4095 and hyper.min() == 0
+    assert not np.array_equal(hyper, laced)
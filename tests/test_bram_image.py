@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from q_os.bram_image import build_bram_image, write_bram_image
+from q_os.sphy_generator import generate_sphy_waves, get_regularized_sphy_waves, get_entangled_sphy_waves
+
+def test_single_table_mem_matches_readmemh_layout():
+    """A single table is written as one 3-digit hex word per line."""
+    table = np.array([0, 1, 255, 4095])
+    assert build_bram_image(table) == b"000\n001\n0ff\nfff\n"
+
+def test_banked_mem_image():
+    """Multiple tables are packed back to back with an '@addr' marker per bank."""
+    tables = np.array([[1, 2], [3, 4], [5, 6]])
+    image = build_bram_image(tables).decode()
+    assert image.splitlines() == ["@0", "001", "002", "@2", "003", "004", "@4", "005", "006"]
+
+def test_coe_image():
+    """COE images declare the radix and terminate the vector with a semicolon."""
+    image = build_bram_image([[10, 11], [12, 4095]], fmt="coe").decode()
+    lines = image.splitlines()
+    assert lines[0] == "memory_initialization_radix=16;"
+    assert lines[1] == "memory_initialization_vector="
+    assert lines[2:] == ["00a,", "00b,", "00c,", "fff;"]
+
+def test_binary_image_round_trip():
+    """Raw binary images hold little-endian words of the smallest fitting width."""
+    tables = np.stack([get_regularized_sphy_waves(), get_entangled_sphy_waves()])
+    image = build_bram_image(tables, fmt="bin")
+    assert len(image) == tables.size * 2
+    np.testing.assert_array_equal(np.frombuffer(image, dtype="<u2").reshape(tables.shape), tables)
+
+def test_invalid_images():
+    """Out-of-range samples and unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        build_bram_image([0, 4096])
+    with pytest.raises(ValueError):
+        build_bram_image([0, 1], fmt="hex")
+
+def test_generate_multi_bank_file(tmp_path):
+    """generate_sphy_waves writes several modes into one image at a chosen path."""
+    path = tmp_path / "lut_bank.coe"
+    written = generate_sphy_waves(mode=["regularized", "entangled", "classical"], path=str(path))
+    assert written == str(path)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2 + 3 * 256
+    assert int(lines[2].rstrip(","), 16) == get_regularized_sphy_waves()[0]
+
+    bin_path = write_bram_image(get_regularized_sphy_waves(), str(tmp_path / "table.bin"))
+    assert (tmp_path / "table.bin").stat().st_size == 512
+    assert bin_path.endswith("table.bin")
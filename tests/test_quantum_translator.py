@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from q_os.quantum_translator import translate_gate
+from q_os.quantum_translator import translate_gate, translate_circuit
 
 def test_hadamard_gate_translation():
     """
@@ -25,3 +25,50 @@ def test_unknown_gate():
     """
     with pytest.raises(ValueError):
         translate_gate("UNKNOWN")
+
+def test_parameterized_gate_translation():
+    """
+    Test that Cirq gates translate through the registry using their parameters.
+    """
+    import cirq
+    import sympy
+    from qurq.ops import H, CNOT, TopologicalStabilize
+
+    assert np.isclose(translate_gate(cirq.H), translate_gate("H"))
+    assert np.isclose(translate_gate(cirq.CNOT), translate_gate("CNOT"))
+    assert np.isclose(translate_gate(cirq.T), translate_gate("T"))
+    assert np.isclose(translate_gate(cirq.rz(0.3)), 0.3)
+    assert np.isclose(translate_gate(cirq.X**0.25), np.pi / 4)
+    assert np.isclose(translate_gate(H), np.pi / 2)
+    assert np.isclose(translate_gate(CNOT), np.pi)
+    assert "phase_shift" not in CNOT.sphy_modulation()
+    assert np.isclose(translate_gate(TopologicalStabilize(0.01)), 2 * np.pi * 0.01)
+    assert translate_gate(TopologicalStabilize(0.01)) != translate_gate(TopologicalStabilize(0.02))
+
+    theta = sympy.Symbol("theta")
+    with pytest.raises(ValueError):
+        translate_gate(cirq.rz(theta))
+    assert np.isclose(translate_gate(cirq.rz(theta), resolver={"theta": 0.7}), 0.7)
+
+    with pytest.raises(ValueError):
+        translate_gate(cirq.MeasurementGate(1, key="m"))
+
+def test_translate_circuit():
+    """
+    Test that a circuit translates to a (moments x qubits) phase array.
+    """
+    import cirq
+    q = cirq.LineQubit.range(3)
+    circuit = cirq.Circuit([
+        cirq.Moment([cirq.H(q[0]), cirq.X(q[2])]),
+        cirq.Moment([cirq.CNOT(q[0], q[1])]),
+        cirq.Moment([cirq.rz(0.5)(q[1])]),
+    ])
+    phases = translate_circuit(circuit)
+    expected = np.array([
+        [np.pi / 2, 0, np.pi],
+        [np.pi, np.pi, 0],
+        [0, 0.5, 0],
+    ])
+    assert phases.shape == (3, 3)
+    assert np.allclose(phases, expected)
@@ -91,3 +91,37 @@ def test_sphy_wave_entangled_content():
     # Cleanup
     if os.path.exists(filename):
         os.remove(filename)
+
+def test_qubit_marginals_match_bit_loop():
+    """
+    Test the vectorized marginal kernel against the explicit per-bit summation.
+    """
+    from q_os.sphy_generator import get_qubit_marginals
+
+    n_qubits = 6
+    rng = np.random.default_rng(7)
+    state = rng.normal(size=2**n_qubits) + 1j * rng.normal(size=2**n_qubits)
+    state /= np.linalg.norm(state)
+    probabilities = np.abs(state)**2
+
+    expected = [
+        sum(probabilities[i] for i in range(2**n_qubits) if (i >> (n_qubits - 1 - k)) & 1)
+        for k in range(n_qubits)
+    ]
+    np.testing.assert_allclose(get_qubit_marginals(state, n_qubits), expected)
+    np.testing.assert_allclose(get_qubit_marginals(state), expected)
+
+def test_harmonic_basis_cached_and_read_only():
+    """
+    Test that the harmonic basis table is shared between calls and cannot be mutated.
+    """
+    from q_os.sphy_generator import get_harmonic_basis
+
+    basis = get_harmonic_basis(256, 3)
+    assert basis.shape == (2, 3, 256)
+    assert get_harmonic_basis(256, 3) is basis
+    assert not basis.flags.writeable
+
+    x = np.linspace(0, 2 * np.pi, 256)
+    np.testing.assert_allclose(basis[0, 2], np.sin(3 * x))
+    np.testing.assert_allclose(basis[1, 0], np.cos(x))
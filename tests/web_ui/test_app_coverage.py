@@ -39,6 +39,25 @@ def test_translate_endpoint_with_driver(client):
         assert response.status_code == 200
         mock_driver.write_waveform.assert_called_once()
 
+def test_translate_uses_cached_waveform(client):
+    """Test translate endpoint writes the precomputed gate waveform."""
+    import numpy as np
+    from web_ui.app import get_gate_waveform
+    from q_os.sphy_generator import get_regularized_sphy_waves, get_entangled_sphy_waves
+
+    # Standard gates are warmed at import time
+    hits = get_gate_waveform.cache_info().hits
+    with patch('web_ui.app.driver') as mock_driver:
+        response = client.post('/api/translate', json={'gate': 'H'})
+        assert response.status_code == 200
+        written = mock_driver.write_waveform.call_args[0][0]
+    assert get_gate_waveform.cache_info().hits == hits + 1
+
+    expected = (get_regularized_sphy_waves().astype(float) * np.cos(np.pi / 4)).astype(int)
+    assert np.array_equal(written, expected)
+    assert not written.flags.writeable
+    assert np.array_equal(get_gate_waveform("CNOT", np.pi), get_entangled_sphy_waves())
+
 def test_debug_endpoints(client):
     """Test debug API endpoints."""
     # 1. Initial State
@@ -75,3 +94,59 @@ circuit = cirq.Circuit(cirq.H(q))
         
         # Verify load_circuit was called
         mock_sim.load_circuit.assert_called_once()
+
+def test_debug_step_back_and_jump_endpoints(client):
+    """Test step-back and jump-to-step debug endpoints."""
+    debug_info = {
+        "status": "Running",
+        "current_step": 3,
+        "total_steps": 10,
+        "qubit_probabilities": {},
+        "sphy_waves": [0]*256,
+        "current_gate_info": "Jumped to step 3"
+    }
+    with patch('web_ui.app.mimetic_simulator') as mock_sim, patch('web_ui.app.driver') as mock_driver:
+        mock_sim.get_current_debug_info.return_value = debug_info
+        mock_sim.step_back.return_value = True
+        mock_sim.jump_to.return_value = True
+
+        response = client.post('/api/debug/step_back', json={})
+        assert response.status_code == 200
+        assert response.get_json()['current_step'] == 3
+
+        response = client.post('/api/debug/jump', json={'step': 3})
+        assert response.status_code == 200
+        mock_sim.jump_to.assert_called_once_with(3)
+        assert mock_driver.write_waveform.call_count == 2
+
+        response = client.post('/api/debug/jump', json={})
+        assert response.status_code == 400
+
+        mock_sim.jump_to.side_effect = ValueError("Step 99 out of range (0-10)")
+        response = client.post('/api/debug/jump', json={'step': 99})
+        assert response.status_code == 400
+
+        mock_sim.step_back.return_value = False
+        response = client.post('/api/debug/step_back', json={})
+        assert response.get_json()['status'] == "At Start"
+
+def test_debug_info_etag(client):
+    """Test debug info is served from the versioned payload with ETag/304 support."""
+    payload = b'{"status": "Running", "current_step": 1}'
+    with patch('web_ui.app.mimetic_simulator') as mock_sim:
+        mock_sim.get_debug_info_json.return_value = (7, payload)
+
+        response = client.get('/api/debug/info')
+        assert response.status_code == 200
+        assert response.data == payload
+        assert response.get_json()['current_step'] == 1
+        etag = response.headers['ETag']
+
+        response = client.get('/api/debug/info', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+        mock_sim.get_debug_info_json.return_value = (8, payload)
+        response = client.get('/api/debug/info', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
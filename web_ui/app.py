@@ -4,6 +4,8 @@ import os
 import io
 import contextlib
 import time
+import uuid
+from functools import lru_cache
 from dotenv import load_dotenv
 import vertexai
 from vertexai.generative_models import GenerativeModel
@@ -20,9 +22,9 @@ load_dotenv()
 
 # Add the parent directory to the path so we can import q_os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from q_os.sphy_generator import get_regularized_sphy_waves, get_entangled_sphy_waves # noqa: E402
-from q_os.quantum_translator import translate_gate  # noqa: E402
-from q_os.drivers import get_driver  # noqa: E402
+from q_os.sphy_generator import get_regularized_sphy_waves, get_entangled_sphy_waves, COMPACT_WAVE_SPEC, SINGLE_PRECISION_WAVE_SPEC # noqa: E402
+from q_os.quantum_translator import translate_gate, GATE_PHASES  # noqa: E402
+from q_os.drivers import get_driver, ZynqOnChipDriver  # noqa: E402
 import cirq # noqa: E402
 from qurq.ops import H, CNOT, Stabilize # noqa: E402
 from qurq.sim import MimeticSimulator # noqa: E402
@@ -35,7 +37,9 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 driver = get_driver()
 
 # Initialize MimeticSimulator
-mimetic_simulator = MimeticSimulator()
+# On the Zynq ARM target, synthesize SPHY waves in float32 to halve memory traffic per frame
+wave_spec = SINGLE_PRECISION_WAVE_SPEC if isinstance(driver, ZynqOnChipDriver) else COMPACT_WAVE_SPEC
+mimetic_simulator = MimeticSimulator(spec=wave_spec)
 
 # Default configuration for projects directory
 # In tests, this will be overridden
@@ -94,6 +98,9 @@ def restore_last_session():
             else:
                 print("Failed to restore session state.")
 
+# Distinguishes the debug-info ETags of this server process from those of earlier runs
+DEBUG_INFO_EPOCH = uuid.uuid4().hex[:8]
+
 # Restore session on startup
 restore_last_session()
 
@@ -135,6 +142,40 @@ def photonic():
 #     pass # This endpoint is superseded by WebSocket streaming
 
 
+# Bound on distinct (gate, phase) waveforms kept ready for the driver
+GATE_WAVEFORM_CACHE_SIZE = 128
+
+@lru_cache(maxsize=GATE_WAVEFORM_CACHE_SIZE)
+def get_gate_waveform(gate, phase):
+    """
+    Returns the ready-to-write int DAC waveform for a translated gate.
+    The waveform depends only on the gate and its phase, so it is computed
+    once per pair and shared (read-only) across requests.
+    """
+    # --- Physics Simulation Trigger ---
+    if gate == "CNOT":
+        # Use the specific Entangled Waveform for CNOT
+        modulated_wave = get_entangled_sphy_waves().astype(float) # Already modulated
+    else:
+        # Generate the base regularized wave
+        base_wave = get_regularized_sphy_waves().astype(float)
+
+        # Apply the phase modulation (Mimetic Logic)
+        # Simple modulation model: Amplitude modulation proportional to phase for visibility
+        # In real physics, this would be a phase shift in the complex domain
+        modulated_wave = base_wave * np.cos(phase * 0.5)
+
+    waveform = modulated_wave.astype(int)
+    waveform.setflags(write=False)
+    return waveform
+
+def warm_gate_waveform_cache():
+    """Precomputes the waveforms for the standard gate set (the dashboard buttons)."""
+    for gate, phase in GATE_PHASES.items():
+        get_gate_waveform(gate, phase)
+
+warm_gate_waveform_cache()
+
 @app.route('/api/translate', methods=['POST'])
 def translate():
     """
@@ -148,22 +189,8 @@ def translate():
     try:
         phase = translate_gate(gate)
         
-        # --- Physics Simulation Trigger ---
-        if gate == "CNOT":
-            # Use the specific Entangled Waveform for CNOT
-            base_wave = get_entangled_sphy_waves().astype(float)
-            modulated_wave = base_wave # Already modulated
-        else:
-            # Generate the base regularized wave
-            base_wave = get_regularized_sphy_waves().astype(float)
-            
-            # Apply the phase modulation (Mimetic Logic)
-            # Simple modulation model: Amplitude modulation proportional to phase for visibility
-            # In real physics, this would be a phase shift in the complex domain
-            modulated_wave = base_wave * np.cos(phase * 0.5) 
-        
         # Write to the driver to start the convergence loop
-        driver.write_waveform(modulated_wave.astype(int))
+        driver.write_waveform(get_gate_waveform(gate, phase))
         
         return jsonify({'gate': gate, 'phase_shift': phase})
     except ValueError as e:
@@ -277,9 +304,8 @@ def execute():
                 print(f"\n[Q-OS Kernel] Detected Quantum Circuit. Executing on Mimetic Simulator...")
                 mimetic_simulator.load_circuit(circuit)
                 
-                # Run to completion (fast-forward)
-                while mimetic_simulator.step():
-                    pass
+                # Run to completion (fast-forward, fused gates, one final SPHY wave)
+                mimetic_simulator.run()
                 
                 # Get final state
                 debug_info = mimetic_simulator.get_current_debug_info()
@@ -354,6 +380,7 @@ telemetry_thread = None
 capture_thread = None
 photonic_entropy_level = 0.0
 screen_brightness_modulation = 0.0
+telemetry_rng = np.random.default_rng()
 
 def generate_telemetry_frame(driver_instance, sim_instance, phase_drift, entropy_level=0.0, brightness_level=0.0):
     """
@@ -363,20 +390,27 @@ def generate_telemetry_frame(driver_instance, sim_instance, phase_drift, entropy
     waves = None
     leds = [0, 0, 0, 0]
     is_hardware = 'ZynqOnChipDriver' in str(type(driver_instance))
-    
-    drift = int(phase_drift) % 256
 
     # Prioritize debugger's SPHY wave if a circuit is loaded
     if sim_instance._circuit is not None:
         base_waves = sim_instance._sphy_waves
         if base_waves is not None:
-             # Apply phase drift (rolling the wave) to simulate time evolution
-            waves = np.roll(base_waves, drift)
-            
+            # The frame is built in one float32 buffer: noise, drift and clipping update it in place
+            length = len(base_waves)
+            drift = int(phase_drift) % length
+            frame = np.empty(length, dtype=np.float32)
+
             # Add subtle thermal noise for realism, modulated by Photonic Entropy AND Screen Brightness
             noise_amp = 10 + (entropy_level * 500) + (brightness_level * 50)
-            noise = np.random.normal(0, noise_amp, 256)
-            waves = np.clip(waves + noise, 0, 4095).astype(int)
+            telemetry_rng.standard_normal(dtype=np.float32, out=frame)
+            frame *= noise_amp
+
+            # Apply phase drift (rolling the wave) to simulate time evolution
+            frame[drift:] += base_waves[:length - drift]
+            frame[:drift] += base_waves[length - drift:]
+
+            np.clip(frame, 0, 4095, out=frame)
+            waves = frame.astype(np.uint16)
     else:
         # Fallback to direct driver telemetry
         telemetry = driver_instance.read_telemetry(length=256)
@@ -551,6 +585,51 @@ def debug_step_circuit():
         import traceback
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
 
+@app.route('/api/debug/step_back', methods=['POST'])
+def debug_step_back_circuit():
+    data = request.json
+    project_name = data.get('project')
+
+    try:
+        if mimetic_simulator.step_back():
+            debug_info = mimetic_simulator.get_current_debug_info()
+            driver.write_waveform(np.array(debug_info['sphy_waves']).astype(int)) # Update hardware/driver
+
+            if project_name:
+                save_project_state(project_name)
+
+            return jsonify(debug_info)
+        else:
+            return jsonify({'status': 'At Start', 'current_step': mimetic_simulator.get_current_debug_info()['current_step']}), 200
+    except Exception as e:
+        import traceback
+        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+
+@app.route('/api/debug/jump', methods=['POST'])
+def debug_jump_circuit():
+    data = request.json
+    project_name = data.get('project')
+    step = data.get('step')
+
+    if not isinstance(step, int):
+        return jsonify({'error': 'An integer step is required'}), 400
+
+    try:
+        if not mimetic_simulator.jump_to(step):
+            return jsonify({'error': 'No circuit loaded'}), 400
+        debug_info = mimetic_simulator.get_current_debug_info()
+        driver.write_waveform(np.array(debug_info['sphy_waves']).astype(int)) # Update hardware/driver
+
+        if project_name:
+            save_project_state(project_name)
+
+        return jsonify(debug_info)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        import traceback
+        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+
 @app.route('/api/debug/reset', methods=['POST'])
 def debug_reset_circuit():
     data = request.json
@@ -571,9 +650,13 @@ def debug_reset_circuit():
 
 @app.route('/api/debug/info', methods=['GET'])
 def debug_get_info():
+    # Polled by the IDE: serve the JSON encoded once per simulator version, with an
+    # ETag (unique to this server process) so unchanged state is answered with a 304
     try:
-        debug_info = mimetic_simulator.get_current_debug_info()
-        return jsonify(debug_info)
+        version, payload = mimetic_simulator.get_debug_info_json()
+        response = app.response_class(payload, mimetype='application/json')
+        response.set_etag(f"{DEBUG_INFO_EPOCH}-{version}")
+        return response.make_conditional(request)
     except Exception as e:
         import traceback
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500